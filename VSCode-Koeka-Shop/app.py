@@ -11,7 +11,9 @@ import os
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.auth.authentication import AuthenticationManager, get_auth_manager
+from core.auth.authentication import (AuthenticationManager, get_auth_manager,
+                                     ensure_demo_user, create_default_admin)
+from core.database.connection import get_db_manager
 from core.ui.main_window import MainWindow
 from config.settings import get_settings_manager
 
@@ -153,8 +155,6 @@ class LoginScreen:
 def initialize_demo_users():
     """Ensure demo users exist for testing"""
     try:
-        from core.auth.authentication import ensure_demo_user, create_default_admin
-        
         # Create default admin if not exists
         create_default_admin()
         
@@ -170,8 +170,6 @@ def initialize_demo_users():
 def check_system_requirements():
     """Check if system is properly initialized"""
     try:
-        from core.database.connection import get_db_manager
-        
         # Test database connection
         db = get_db_manager()
         
@@ -0,0 +1,21 @@
+"""
+pytest configuration for the test scripts
+Gives every pytest-xdist worker its own SQLite database file
+
+pytest puts this file's directory (the project root) on sys.path, which is
+what lets the test scripts import core/modules/utils without path setup.
+"""
+
+import os
+import tempfile
+
+# Must run before core.database.connection is imported: the global
+# DatabaseManager reads KOEKA_TEST_DB when it is created.
+_worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+if _worker_id and "KOEKA_TEST_DB" not in os.environ:
+    _db_path = os.path.join(tempfile.gettempdir(), f"koeka_test_{_worker_id}.db")
+    # Start each run from a fresh schema
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(_db_path + suffix):
+            os.remove(_db_path + suffix)
+    os.environ["KOEKA_TEST_DB"] = _db_path
@@ -7,11 +7,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Add project root to path when run directly as a script
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from core.database.connection import get_db_manager
 from utils.helpers import verify_password, hash_password
@@ -185,6 +187,46 @@ class AuthenticationManager:
         
         return self.db.get_last_insert_id(query, (username, password_hash, full_name, role))
     
+    def create_users_bulk(self, users: List[Tuple[str, str, str, str]]) -> List[Optional[int]]:
+        """Create several (username, password, full_name, role) accounts in one transaction
+        
+        Usernames that already exist are skipped and get None in the returned id list.
+        """
+        # Validate everything before touching the database
+        for username, password, full_name, role in users:
+            if not validate_username(username):
+                raise ValueError(f"Invalid username format: {username}")
+            if not validate_password(password):
+                raise ValueError("Password must be at least 6 characters with letters and numbers")
+            if role not in ['admin', 'pos_operator', 'stock_manager']:
+                raise ValueError("Invalid role")
+        
+        # Hash before opening the write transaction: each PBKDF2 hash takes ~100 ms
+        # and would otherwise hold the database lock. hashlib releases the GIL while
+        # hashing, so the hashes run in parallel.
+        passwords = [password for _, password, _, _ in users]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            password_hashes = list(pool.map(hash_password, passwords))
+        rows = [
+            (username, password_hash, full_name, role)
+            for (username, _, full_name, role), password_hash in zip(users, password_hashes)
+        ]
+        
+        query = """
+            INSERT OR IGNORE INTO users (username, password_hash, full_name, role, created_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """
+        
+        user_ids = []
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for row in rows:
+                cursor.execute(query, row)
+                user_ids.append(cursor.lastrowid if cursor.rowcount else None)
+            conn.commit()
+        
+        return user_ids
+    
     def change_password(self, user_id: int, current_password: str, 
                        new_password: str) -> bool:
         """Change user password"""
@@ -405,6 +447,22 @@ def ensure_demo_user():
         except Exception as e:
             print(f"Warning: Could not create demo user: {e}")
 
+def create_default_admin():
+    """Ensure the default admin account exists"""
+    auth_manager = get_auth_manager()
+    
+    # Check if admin user exists
+    db = get_db_manager()
+    existing = db.execute_query("SELECT id FROM users WHERE username = ?", ("admin",))
+    
+    if not existing:
+        # Create admin user
+        try:
+            auth_manager.create_user("admin", "admin123", "System Administrator", "admin", 1)
+            print(" Admin user created (username: admin, password: admin123)")
+        except Exception as e:
+            print(f"Warning: Could not create admin user: {e}")
+
 def show_login_dialog(parent=None) -> Optional[User]:
     """Show login dialog and return authenticated user"""
     ensure_demo_user()
@@ -137,9 +137,44 @@ INSERT OR IGNORE INTO system_config (key, value, description) VALUES
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_products_barcode ON products(barcode);
 CREATE INDEX IF NOT EXISTS idx_products_category ON products(category);
+CREATE INDEX IF NOT EXISTS idx_products_low_stock ON products(current_stock, min_stock, name, category)
+    WHERE current_stock <= min_stock AND current_stock >= 0;
 CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(date_time);
 CREATE INDEX IF NOT EXISTS idx_sales_user ON sales(user_id);
+CREATE INDEX IF NOT EXISTS idx_sales_datetime_voided ON sales(date_time, voided);
+CREATE INDEX IF NOT EXISTS idx_sales_datetime_payment ON sales(date_time, payment_method);
+DROP INDEX IF EXISTS idx_sale_items_sale_id;
+CREATE INDEX IF NOT EXISTS idx_sale_items_sale_product ON sale_items(sale_id, product_id, quantity, total_price);
 CREATE INDEX IF NOT EXISTS idx_stock_movements_product ON stock_movements(product_id);
 CREATE INDEX IF NOT EXISTS idx_stock_movements_date ON stock_movements(date_time);
 CREATE INDEX IF NOT EXISTS idx_sms_log_transaction ON sms_log(transaction_ref);
 CREATE INDEX IF NOT EXISTS idx_sms_log_phone ON sms_log(phone_number);
+
+-- Keep the day's running cash/card totals current as sales are recorded or voided
+CREATE TRIGGER IF NOT EXISTS trg_sales_daily_cash_insert
+AFTER INSERT ON sales
+WHEN NEW.voided = 0
+BEGIN
+    UPDATE daily_cash
+    SET cash_sales = cash_sales + (CASE NEW.payment_method WHEN 'cash' THEN NEW.total_amount
+                                                           WHEN 'mixed' THEN NEW.cash_amount ELSE 0 END),
+        card_sales = card_sales + (CASE NEW.payment_method WHEN 'card' THEN NEW.total_amount
+                                                           WHEN 'mixed' THEN NEW.card_amount ELSE 0 END),
+        expected_closing = expected_closing + (CASE NEW.payment_method WHEN 'cash' THEN NEW.total_amount
+                                                                       WHEN 'mixed' THEN NEW.cash_amount ELSE 0 END)
+    WHERE date = DATE(NEW.date_time);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_sales_daily_cash_void
+AFTER UPDATE OF voided ON sales
+WHEN OLD.voided = 0 AND NEW.voided = 1
+BEGIN
+    UPDATE daily_cash
+    SET cash_sales = cash_sales - (CASE NEW.payment_method WHEN 'cash' THEN NEW.total_amount
+                                                           WHEN 'mixed' THEN NEW.cash_amount ELSE 0 END),
+        card_sales = card_sales - (CASE NEW.payment_method WHEN 'card' THEN NEW.total_amount
+                                                           WHEN 'mixed' THEN NEW.card_amount ELSE 0 END),
+        expected_closing = expected_closing - (CASE NEW.payment_method WHEN 'cash' THEN NEW.total_amount
+                                                                       WHEN 'mixed' THEN NEW.cash_amount ELSE 0 END)
+    WHERE date = DATE(NEW.date_time);
+END;
@@ -5,17 +5,47 @@ Handles SQLite database setup, connections, and initialization
 
 import sqlite3
 import os
+import atexit
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Optional
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+class TrackedConnection(sqlite3.Connection):
+    """sqlite3 connection that remembers which database file it was opened on"""
+    opened_path: str = ""
 
 class DatabaseManager:
     """Manages SQLite database connections and initialization"""
     
+    # Applied to every new connection; journal_mode=WAL is persistent and set once
+    # in _initialize_schema. foreign_keys is left off: delete_product removes
+    # products that sale_items and stock_movements still reference.
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -20000",
+        "PRAGMA mmap_size = 268435456",
+    )
+    
+    # Idle connections kept open for reuse by get_connection
+    POOL_SIZE = 4
+    
     def __init__(self, db_path: str = "spaza_shop.db"):
         """Initialize database manager with database path"""
         self.db_path = db_path
         self.schema_path = Path(__file__).parent / "base_schema.sql"
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=self.POOL_SIZE)
+        # Read-only connections owned by the parallel query worker threads
+        self._reader = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+        self._read_executor: Optional[ThreadPoolExecutor] = None
+        # Never writes, so its PRAGMA data_version sees every other connection's commits
+        self._version_conn: Optional[sqlite3.Connection] = None
         self._ensure_database_exists()
     
     def _ensure_database_exists(self):
@@ -42,7 +72,15 @@ class DatabaseManager:
                 schema_sql = schema_file.read()
             
             with self.get_connection() as conn:
+                # WAL lets report reads run alongside sale writes
+                conn.execute("PRAGMA journal_mode = WAL")
                 conn.executescript(schema_sql)
+                # Gather planner statistics once per database so the composite
+                # indexes get chosen; sqlite_stat1 exists once ANALYZE has run
+                if not conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+                ).fetchone():
+                    conn.execute("ANALYZE")
                 conn.commit()
                 print("Database schema initialized successfully")
         except FileNotFoundError:
@@ -50,13 +88,46 @@ class DatabaseManager:
         except sqlite3.Error as e:
             raise Exception(f"Failed to initialize schema: {e}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a configured connection to the database"""
+        # Pooled connections may be handed to a different thread on each checkout;
+        # the pool guarantees only one user at a time
+        conn = sqlite3.connect(self.db_path, cached_statements=256, check_same_thread=False,
+                               factory=TrackedConnection)
+        conn.opened_path = self.db_path
+        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _acquire_connection(self) -> sqlite3.Connection:
+        """Take an idle pooled connection, or open a new one"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        
+        # db_path may have been pointed at another file since this was opened
+        if conn.opened_path != self.db_path:
+            conn.close()
+            return self._connect()
+        return conn
+    
+    def _release_connection(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
     @contextmanager
     def get_connection(self):
-        """Get database connection with automatic cleanup"""
+        """Get a pooled database connection with automatic cleanup"""
         conn = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+            conn = self._acquire_connection()
             yield conn
         except sqlite3.Error as e:
             if conn:
@@ -64,7 +135,19 @@ class DatabaseManager:
             raise Exception(f"Database error: {e}")
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """Get a connection whose statements commit together in one write transaction"""
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
     
     def execute_query(self, query: str, params: tuple = None) -> list:
         """Execute SELECT query and return results"""
@@ -76,6 +159,92 @@ class DatabaseManager:
                 cursor.execute(query)
             return cursor.fetchall()
     
+    def execute_query_iter(self, query: str, params: tuple = None) -> Iterator[sqlite3.Row]:
+        """Execute SELECT query and yield rows as they are fetched"""
+        with self.get_connection() as conn:
+            yield from conn.execute(query, params or ())
+    
+    def execute_many_queries(self, queries_and_params: Sequence[Tuple[str, tuple]]) -> List[list]:
+        """Execute several SELECT queries on one connection and return each result list
+        
+        The queries share one read transaction, so they all see the same
+        snapshot of the database even while sales are being written.
+        """
+        results = []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            for query, params in queries_and_params:
+                cursor.execute(query, params or ())
+                results.append(cursor.fetchall())
+            conn.commit()
+        return results
+    
+    def _execute_read(self, query: str, params: tuple) -> list:
+        """Run a SELECT on the calling worker thread's own connection"""
+        try:
+            conn = getattr(self._reader, 'conn', None)
+            if conn is None:
+                conn = self._reader.conn = self._connect()
+                with self._reader_lock:
+                    self._reader_conns.append(conn)
+            return conn.execute(query, params or ()).fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Database error: {e}")
+    
+    def execute_queries_parallel(self, queries_and_params: Sequence[Tuple[str, tuple]]) -> List[list]:
+        """Execute independent SELECT queries concurrently and return each result list
+        
+        Each worker thread keeps its own connection; WAL mode lets the reads
+        proceed side by side. Only use this for reads. The queries may see
+        different snapshots, so use execute_many_queries when the results
+        must agree with each other.
+        """
+        if self._read_executor is None:
+            self._read_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="db-read")
+        futures = [
+            self._read_executor.submit(self._execute_read, query, params)
+            for query, params in queries_and_params
+        ]
+        return [future.result() for future in futures]
+    
+    def data_version(self) -> int:
+        """Counter that changes whenever data is committed to the database
+        
+        SQLite's PRAGMA data_version only reflects commits made by other
+        connections, so it is read on a dedicated connection that never writes.
+        Commits from other processes are seen too.
+        """
+        with self._reader_lock:
+            conn = self._version_conn
+            if conn is None or conn.opened_path != self.db_path:
+                if conn is not None:
+                    conn.close()
+                conn = self._version_conn = self._connect()
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def close(self):
+        """Stop the read worker threads and close every open connection
+        
+        The manager stays usable; connections are reopened on demand.
+        """
+        if self._read_executor is not None:
+            self._read_executor.shutdown(wait=True)
+            self._read_executor = None
+        with self._reader_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+    
     def execute_update(self, query: str, params: tuple = None) -> int:
         """Execute INSERT/UPDATE/DELETE query and return affected rows"""
         with self.get_connection() as conn:
@@ -98,9 +267,25 @@ class DatabaseManager:
             conn.commit()
             return cursor.lastrowid
 
-# Global database manager instance
-db_manager = DatabaseManager()
+# Global database manager instance, created on first use so importing this
+# module doesn't create a database file in the working directory.
+# KOEKA_TEST_DB points it at another file so test runs (one file per
+# pytest-xdist worker) don't touch the shop database.
+_db_manager: Optional[DatabaseManager] = None
 
 def get_db_manager() -> DatabaseManager:
     """Get the global database manager instance"""
-    return db_manager
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DatabaseManager(os.environ.get("KOEKA_TEST_DB", "spaza_shop.db"))
+        atexit.register(_db_manager.close)
+    return _db_manager
+
+def set_db_path(db_path: str) -> DatabaseManager:
+    """Point the global database manager at db_path, creating it if needed"""
+    global _db_manager
+    if _db_manager is not None:
+        _db_manager.close()
+    _db_manager = DatabaseManager(db_path)
+    atexit.register(_db_manager.close)
+    return _db_manager
@@ -3,7 +3,7 @@ Product management for Tembie's Spaza Shop POS System
 Handles CRUD operations for products and stock management
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, date
 from typing import List, Optional, Dict, Any
 from core.database.connection import get_db_manager
@@ -31,25 +31,42 @@ class ProductManager:
     
     CATEGORIES = ['Food', 'Household', 'Sweets', 'Cooldrinks', 'Other']
     
+    # Shared by create_product and create_products_bulk so both reuse one cached statement
+    _INSERT_QUERY = """
+        INSERT INTO products 
+        (name, barcode, category, cost_price, sell_price, current_stock, 
+         monthly_stock, min_stock, vat_rate, vat_inclusive, expiry_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    # Bumped on every product write; shared so that all manager instances
+    # (e.g. the one owned by TransactionManager) invalidate together
+    _version = 0
+    
     def __init__(self):
         self.db = get_db_manager()
+        self._cache: Dict[bool, List[Product]] = {}
+        self._cache_version = -1
     
-    def create_product(self, product: Product, user_id: int) -> int:
-        """Create a new product"""
-        query = """
-            INSERT INTO products 
-            (name, barcode, category, cost_price, sell_price, current_stock, 
-             monthly_stock, min_stock, vat_rate, vat_inclusive, expiry_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
+    @classmethod
+    def _invalidate_cache(cls):
+        """Mark cached product lists as stale after a write"""
+        cls._version += 1
+    
+    @staticmethod
+    def _insert_params(product: Product) -> tuple:
+        """Parameters for _INSERT_QUERY in column order"""
+        return (
             product.name, product.barcode, product.category,
             product.cost_price, product.sell_price, product.current_stock,
             product.monthly_stock, product.min_stock, product.vat_rate,
             product.vat_inclusive, product.expiry_date
         )
-        
-        product_id = self.db.get_last_insert_id(query, params)
+    
+    def create_product(self, product: Product, user_id: int) -> int:
+        """Create a new product"""
+        product_id = self.db.get_last_insert_id(self._INSERT_QUERY, self._insert_params(product))
+        self._invalidate_cache()
         
         # Log initial stock if greater than 0
         if product.current_stock > 0:
@@ -60,6 +77,86 @@ class ProductManager:
         
         return product_id
     
+    def create_products_bulk(self, products: List[Product], user_id: int,
+                             skip_existing: bool = False) -> List[Optional[int]]:
+        """Create several products in a single transaction
+        
+        With skip_existing, products whose barcode is already taken are left
+        alone and get None in the returned id list.
+        """
+        movement_query = """
+            INSERT INTO stock_movements 
+            (product_id, movement_type, quantity_change, previous_stock, 
+             new_stock, user_id, reason, reference_id)
+            VALUES (?, 'addition', ?, 0, ?, ?, 'Initial stock', NULL)
+        """
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Take the write lock up front so the taken-barcode check and the
+            # id lookup below see no other writer's rows
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            new_indexes = list(range(len(products)))
+            if skip_existing:
+                barcodes = [p.barcode for p in products if p.barcode]
+                taken = set()
+                if barcodes:
+                    placeholders = ",".join("?" * len(barcodes))
+                    cursor.execute(f"SELECT barcode FROM products WHERE barcode IN ({placeholders})",
+                                   barcodes)
+                    taken = {row[0] for row in cursor.fetchall()}
+                new_indexes = []
+                for index, product in enumerate(products):
+                    if product.barcode in taken:
+                        continue
+                    if product.barcode:
+                        taken.add(product.barcode)  # first of any duplicates wins
+                    new_indexes.append(index)
+            new_products = [products[index] for index in new_indexes]
+            
+            cursor.executemany(self._INSERT_QUERY, [self._insert_params(p) for p in new_products])
+            
+            # AUTOINCREMENT ids are handed out in insertion order, so the newest
+            # len(new_products) rows are ours
+            new_ids = []
+            if new_products:
+                cursor.execute("SELECT id FROM products ORDER BY id DESC LIMIT ?", (len(new_products),))
+                new_ids = [row[0] for row in reversed(cursor.fetchall())]
+            
+            # Log initial stock if greater than 0
+            movements = [
+                (product_id, product.current_stock, product.current_stock, user_id)
+                for product, product_id in zip(new_products, new_ids)
+                if product.current_stock > 0
+            ]
+            if movements:
+                cursor.executemany(movement_query, movements)
+            conn.commit()
+        
+        self._invalidate_cache()
+        
+        product_ids: List[Optional[int]] = [None] * len(products)
+        for index, product_id in zip(new_indexes, new_ids):
+            product_ids[index] = product_id
+        return product_ids
+    
+    def _seed_raw(self, products: List[Product]) -> List[int]:
+        """Insert products in one transaction without logging initial stock
+        
+        For tests: the products have no stock movements, so can_delete_product
+        allows a safe delete.
+        """
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            product_ids = []
+            for product in products:
+                cursor.execute(self._INSERT_QUERY, self._insert_params(product))
+                product_ids.append(cursor.lastrowid)
+        
+        self._invalidate_cache()
+        return product_ids
+    
     def update_product(self, product: Product, user_id: int) -> bool:
         """Update an existing product"""
         query = """
@@ -76,7 +173,9 @@ class ProductManager:
             product.expiry_date, product.id
         )
         
-        return self.db.execute_update(query, params) > 0
+        updated = self.db.execute_update(query, params) > 0
+        self._invalidate_cache()
+        return updated
     
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
         """Get product by ID"""
@@ -87,6 +186,17 @@ class ProductManager:
             return self._row_to_product(results[0])
         return None
     
+    def get_products_by_ids(self, product_ids: List[int]) -> Dict[int, Product]:
+        """Get several products in one query, keyed by ID (missing IDs are left out)"""
+        if not product_ids:
+            return {}
+        
+        placeholders = ", ".join("?" * len(product_ids))
+        query = f"SELECT * FROM products WHERE id IN ({placeholders})"
+        results = self.db.execute_query(query, tuple(product_ids))
+        
+        return {row['id']: self._row_to_product(row) for row in results}
+    
     def get_product_by_barcode(self, barcode: str) -> Optional[Product]:
         """Get product by barcode"""
         query = "SELECT * FROM products WHERE barcode = ?"
@@ -116,21 +226,49 @@ class ProductManager:
         return [self._row_to_product(row) for row in results]
     
     def get_all_products(self, include_archived: bool = False) -> List[Product]:
-        """Get all products"""
-        if include_archived:
-            query = "SELECT * FROM products ORDER BY name"
-        else:
-            query = "SELECT * FROM products WHERE (archived IS NULL OR archived = 0) ORDER BY name"
+        """Get all products (cached until the next product write)
+        
+        Callers get their own copies, so editing a returned product doesn't
+        change what later callers see.
+        """
+        if self._cache_version != ProductManager._version:
+            self._cache = {}
+            self._cache_version = ProductManager._version
+        
+        cached = self._cache.get(include_archived)
+        if cached is None:
+            if include_archived:
+                query = "SELECT * FROM products ORDER BY name"
+            else:
+                query = "SELECT * FROM products WHERE (archived IS NULL OR archived = 0) ORDER BY name"
+            
+            results = self.db.execute_query(query)
+            cached = self._cache[include_archived] = [self._row_to_product(row) for row in results]
+        
+        return [replace(product) for product in cached]
+    
+    def get_first_active_products(self, limit: int) -> List[Product]:
+        """Get the first few non-archived products in ID order
+        
+        Walks the table in rowid order and stops after `limit` matches, so only
+        the returned rows are read and converted.
+        """
+        query = """
+            SELECT * FROM products 
+            WHERE (archived IS NULL OR archived = 0) 
+            ORDER BY id 
+            LIMIT ?
+        """
+        results = self.db.execute_query(query, (limit,))
         
-        results = self.db.execute_query(query)
         return [self._row_to_product(row) for row in results]
     
     def get_low_stock_products(self) -> List[Product]:
         """Get products with stock below minimum level"""
-        query = "SELECT * FROM products WHERE current_stock <= min_stock ORDER BY current_stock"
-        results = self.db.execute_query(query)
-        
-        return [self._row_to_product(row) for row in results]
+        # Archived products are included, as they always have been in this report
+        low_stock = [p for p in self.get_all_products(include_archived=True)
+                     if p.current_stock <= p.min_stock]
+        return sorted(low_stock, key=lambda p: p.current_stock)
     
     def adjust_stock(self, product_id: int, quantity_change: int, 
                     movement_type: str, user_id: int, reason: str = "") -> bool:
@@ -155,6 +293,7 @@ class ProductManager:
         """
         
         if self.db.execute_update(query, (new_stock, product_id)) > 0:
+            self._invalidate_cache()
             # Log the movement
             self._log_stock_movement(
                 product_id, movement_type, quantity_change,
@@ -185,6 +324,7 @@ class ProductManager:
         """
         
         if self.db.execute_update(query, (new_stock, product_id)) > 0:
+            self._invalidate_cache()
             # Log the movement with sale reference
             self._log_stock_movement(
                 product_id, 'sale', -quantity,
@@ -295,12 +435,57 @@ class ProductManager:
             # Delete the product
             delete_query = "DELETE FROM products WHERE id = ?"
             rows_affected = self.db.execute_update(delete_query, (product_id,))
+            self._invalidate_cache()
             
             return rows_affected > 0
             
         except Exception as e:
             raise ValueError(f"Failed to delete product: {str(e)}")
     
+    def delete_products_bulk(self, product_ids: List[int], user_id: int) -> int:
+        """
+        Force delete several products in a single transaction
+        
+        As with delete_product(force=True), sale_items and stock_movements are
+        kept for historical reports, and products that have any are logged with
+        a movement writing off their remaining stock ('adjustment'; the schema
+        has no 'deletion' type). Stock is read inside the transaction.
+        
+        Returns:
+            int: Number of products deleted
+        """
+        if not product_ids:
+            return 0
+        
+        placeholders = ",".join("?" * len(product_ids))
+        movement_query = f"""
+            INSERT INTO stock_movements 
+            (product_id, movement_type, quantity_change, previous_stock, 
+             new_stock, user_id, reason, reference_id)
+            SELECT id, 'adjustment', -current_stock, current_stock, 0, ?,
+                   'Product deleted (force): had ' || sales_count || ' sales, '
+                       || movements_count || ' movements',
+                   NULL
+            FROM (
+                SELECT p.id, p.current_stock,
+                       (SELECT COUNT(*) FROM sale_items WHERE product_id = p.id) AS sales_count,
+                       (SELECT COUNT(*) FROM stock_movements WHERE product_id = p.id) AS movements_count
+                FROM products p
+                WHERE p.id IN ({placeholders})
+            )
+            WHERE sales_count > 0 OR movements_count > 0
+        """
+        
+        with self.db.transaction() as conn:
+            conn.execute(movement_query, (user_id, *product_ids))
+            rows_affected = conn.execute(
+                f"DELETE FROM products WHERE id IN ({placeholders})",
+                tuple(product_ids)
+            ).rowcount
+        
+        self._invalidate_cache()
+        return rows_affected
+    
     def archive_product(self, product_id: int, user_id: int) -> bool:
         """
         Archive a product instead of deleting it (soft delete)
@@ -309,7 +494,7 @@ class ProductManager:
         # Add an 'archived' column if it doesn't exist
         try:
             self.db.execute_update("ALTER TABLE products ADD COLUMN archived BOOLEAN DEFAULT 0", ())
-        except:
+        except Exception:
             # Column might already exist
             pass
         
@@ -320,6 +505,7 @@ class ProductManager:
             WHERE id = ?
         """
         rows_affected = self.db.execute_update(archive_query, (product_id,))
+        self._invalidate_cache()
         
         if rows_affected > 0:
             # Log the archival
@@ -345,7 +531,7 @@ class ProductManager:
         try:
             results = self.db.execute_query(query)
             return [self._row_to_product(row) for row in results]
-        except:
+        except Exception:
             # If archived column doesn't exist, return empty list
             return []
     
@@ -357,6 +543,7 @@ class ProductManager:
             WHERE id = ? AND archived = 1
         """
         rows_affected = self.db.execute_update(restore_query, (product_id,))
+        self._invalidate_cache()
         
         if rows_affected > 0:
             self._log_stock_movement(
@@ -50,6 +50,8 @@ class CashManager:
         )) > 0
         
         if success:
+            # Pick up any sales rung up before the day was started
+            self.update_sales_totals(today)
             self._log_cash_activity(user_id, f"Started day with opening amount R{opening_amount:.2f}")
         
         return success
@@ -82,7 +84,11 @@ class CashManager:
         return None
     
     def update_sales_totals(self, target_date: date = None) -> bool:
-        """Update cash and card sales totals from sales data"""
+        """Recalculate cash and card sales totals from sales data
+        
+        Day-to-day totals are maintained by triggers on the sales table;
+        this full recount is only needed to resync.
+        """
         if target_date is None:
             target_date = date.today()
         
@@ -195,7 +201,6 @@ class CashManager:
         if target_date is None:
             target_date = date.today()
         
-        self.update_sales_totals(target_date)
         daily_cash = self.get_daily_cash(target_date)
         
         if not daily_cash:
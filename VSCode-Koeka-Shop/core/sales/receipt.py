@@ -4,7 +4,7 @@ Handles screen display, printing, and SMS receipt functionality
 """
 
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from core.sales.transaction import Sale
 from core.database.connection import get_db_manager
 
@@ -28,12 +28,29 @@ class ReceiptGenerator:
         self.config.setdefault('shop_name', "Tembie's Spaza Shop")
         self.config.setdefault('receipt_footer', "Thank you for your business!")
     
-    def generate_receipt_text(self, sale: Sale) -> str:
-        """Generate receipt text for screen display or printing"""
+    def generate_receipt_text(self, sale: Sale, max_len: Optional[int] = None) -> str:
+        """Generate receipt text for screen display or printing
+        
+        With max_len, stop formatting once the receipt is longer than max_len
+        characters and return the first max_len followed by "...".
+        """
+        if max_len is None:
+            return "\n".join(self._iter_receipt_lines(sale))
+        
         receipt_lines = []
+        length = -1  # No newline before the first line
+        for line in self._iter_receipt_lines(sale):
+            receipt_lines.append(line)
+            length += len(line) + 1
+            if length > max_len:
+                return "\n".join(receipt_lines)[:max_len] + "..."
         
+        return "\n".join(receipt_lines)
+    
+    def _iter_receipt_lines(self, sale: Sale) -> Iterator[str]:
+        """Yield receipt lines in order, formatting each one on demand"""
         # Header
-        receipt_lines.extend([
+        yield from [
             "=" * 50,
             "PROOF OF PURCHASE".center(50),
             "=" * 50,
@@ -44,23 +61,23 @@ class ReceiptGenerator:
             f"Date: {sale.date_time.strftime('%Y-%m-%d %H:%M:%S')}",
             "",
             "-" * 50,
-        ])
+        ]
         
         # Items
-        receipt_lines.append(f"{'Item':<20} {'Qty':<5} {'Price':<10} {'Total':<10}")
-        receipt_lines.append("-" * 50)
+        yield f"{'Item':<20} {'Qty':<5} {'Price':<10} {'Total':<10}"
+        yield "-" * 50
         
         for item in sale.items:
             item_name = item.product_name[:18] if len(item.product_name) > 18 else item.product_name
-            receipt_lines.append(
+            yield (
                 f"{item_name:<20} {item.quantity:<5} "
                 f"R{item.unit_price:<9.2f} R{item.total_price:<9.2f}"
             )
         
-        receipt_lines.append("-" * 50)
+        yield "-" * 50
         
         # Totals
-        receipt_lines.extend([
+        yield from [
             f"{'Items:':<30} {sale.item_count:>5}",
             "",
             f"{'Subtotal:':<30} R{sale.subtotal:>12.2f}",
@@ -68,29 +85,29 @@ class ReceiptGenerator:
             "",
             f"{'TOTAL:':<30} R{sale.total_amount:>12.2f}",
             "=" * 50,
-        ])
+        ]
         
         # Payment details
         if sale.payment_method == 'cash':
-            receipt_lines.extend([
+            yield from [
                 f"{'Payment Method:':<30} {'CASH':>15}",
                 f"{'Cash Received:':<30} R{sale.cash_amount:>12.2f}",
                 f"{'Change Given:':<30} R{sale.change_given:>12.2f}",
-            ])
+            ]
         elif sale.payment_method == 'card':
-            receipt_lines.extend([
+            yield from [
                 f"{'Payment Method:':<30} {'CARD':>15}",
                 f"{'Card Amount:':<30} R{sale.card_amount:>12.2f}",
-            ])
+            ]
         elif sale.payment_method == 'mixed':
-            receipt_lines.extend([
+            yield from [
                 f"{'Payment Method:':<30} {'MIXED':>15}",
                 f"{'Card Amount:':<30} R{sale.card_amount:>12.2f}",
                 f"{'Cash Amount:':<30} R{sale.cash_amount:>12.2f}",
                 f"{'Change Given:':<30} R{sale.change_given:>12.2f}",
-            ])
+            ]
         
-        receipt_lines.extend([
+        yield from [
             "",
             "=" * 50,
             "",
@@ -100,9 +117,7 @@ class ReceiptGenerator:
             "Photo with your cell phone if needed".center(50),
             "",
             "=" * 50,
-        ])
-        
-        return "\n".join(receipt_lines)
+        ]
     
     def generate_receipt_data(self, sale: Sale) -> Dict[str, Any]:
         """Generate structured receipt data for UI display"""
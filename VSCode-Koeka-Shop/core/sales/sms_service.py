@@ -4,12 +4,17 @@ Handles SMS notifications including receipt sending
 """
 
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from core.sales.transaction import Sale
 from core.sales.receipt import ReceiptGenerator
 from core.database.connection import get_db_manager
 
+# Compiled once; phone numbers are validated in bulk when importing contacts
+NON_DIGITS = re.compile(r'\D')
+# Separators people type in phone numbers, removed without going through re
+PHONE_SEPARATORS = str.maketrans('', '', '-_ ()+.')
+
 class SMSService:
     """Handles SMS functionality for receipts and notifications"""
     
@@ -41,8 +46,10 @@ class SMSService:
     
     def validate_phone_number(self, phone: str) -> Optional[str]:
         """Validate and format South African phone number"""
-        # Remove all non-digits
-        phone = re.sub(r'[^\d]', '', phone)
+        # Remove all non-digits (separators first; the regex only for anything else)
+        phone = phone.translate(PHONE_SEPARATORS)
+        if not phone.isdecimal():
+            phone = NON_DIGITS.sub('', phone)
         
         # Handle different formats
         if phone.startswith('0'):
@@ -64,6 +71,11 @@ class SMSService:
         
         return None
     
+    def validate_phone_numbers(self, phones: List[str]) -> List[Optional[str]]:
+        """Validate and format a batch of phone numbers (None for invalid ones)"""
+        validate = self.validate_phone_number
+        return [validate(phone) for phone in phones]
+    
     def generate_sms_receipt(self, sale: Sale) -> str:
         """Generate SMS-optimized receipt text"""
         lines = []
@@ -240,6 +252,25 @@ class SMSService:
             # Return empty list if table doesn't exist yet
             return []
     
+    def get_sms_history_for_display(self, limit: int = 20) -> list:
+        """Get SMS history with timestamps and errors already trimmed for display"""
+        query = """
+            SELECT substr(sent_at, 1, 19) AS sent_at, phone_number, transaction_ref, success,
+                   CASE WHEN length(error_message) > 30
+                        THEN substr(error_message, 1, 28) || '...'
+                        ELSE coalesce(error_message, '')
+                   END AS error
+            FROM sms_log
+            ORDER BY sms_log.sent_at DESC
+            LIMIT ?
+        """
+        
+        try:
+            return self.db.execute_query(query, (limit,))
+        except Exception:
+            # Return empty list if table doesn't exist yet
+            return []
+    
     def configure_sms_provider(self, provider: str, api_key: str = None, sender_name: str = None):
         """Configure SMS provider settings"""
         updates = [
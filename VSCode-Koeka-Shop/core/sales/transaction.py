@@ -5,7 +5,7 @@ Handles complete sales workflow including payment processing and stock reduction
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 from core.database.connection import get_db_manager
 from core.products.management import ProductManager, Product
@@ -118,6 +118,51 @@ class TransactionManager:
         
         return True
     
+    def add_items_to_sale(self, items: List[Tuple[int, int]]) -> bool:
+        """Add several (product_id, quantity) items to current sale
+        
+        Products are loaded with one query. Stock is checked for every item
+        before any is added, so a failure leaves the sale unchanged.
+        """
+        if not self.current_sale:
+            raise ValueError("No active sale. Start a new sale first.")
+        
+        products = self.product_manager.get_products_by_ids(
+            list({product_id for product_id, _ in items}))
+        
+        # Quantities already in the sale plus everything requested now
+        required = {item.product_id: item.quantity for item in self.current_sale.items}
+        for product_id, quantity in items:
+            product = products.get(product_id)
+            if not product:
+                raise ValueError(f"Product with ID {product_id} not found")
+            
+            required[product_id] = required.get(product_id, 0) + quantity
+            if product.current_stock < required[product_id]:
+                raise ValueError(f"Insufficient stock. Available: {product.current_stock}, "
+                                 f"Required: {required[product_id]}")
+        
+        existing_items = {item.product_id: item for item in self.current_sale.items}
+        for product_id, quantity in items:
+            existing_item = existing_items.get(product_id)
+            if existing_item:
+                existing_item.quantity += quantity
+                existing_item.total_price = existing_item.unit_price * existing_item.quantity
+            else:
+                product = products[product_id]
+                sale_item = SaleItem(
+                    product_id=product.id,
+                    product_name=product.name,
+                    quantity=quantity,
+                    unit_price=product.sell_price,
+                    total_price=product.sell_price * quantity,
+                    vat_rate=product.vat_rate if product.vat_inclusive else 0.0
+                )
+                self.current_sale.items.append(sale_item)
+                existing_items[product_id] = sale_item
+        
+        return True
+    
     def remove_item_from_sale(self, product_id: int) -> bool:
         """Remove item from current sale"""
         if not self.current_sale:
@@ -194,8 +239,12 @@ class TransactionManager:
         total_paid = self.current_sale.cash_amount + self.current_sale.card_amount
         return total_paid >= self.current_sale.total_amount
     
-    def complete_sale(self) -> int:
-        """Complete the sale transaction and save to database"""
+    def complete_sale(self) -> Sale:
+        """Complete the sale transaction and save to database
+        
+        Returns the completed sale with its database id set, so callers need
+        not load it again with get_sale_by_id.
+        """
         if not self.current_sale:
             raise ValueError("No active sale to complete")
         
@@ -216,9 +265,78 @@ class TransactionManager:
         
         # Clear current sale
         completed_sale = self.current_sale
+        completed_sale.id = sale_id
         self.current_sale = None
         
-        return sale_id
+        return completed_sale
+    
+    def complete_sales_bulk(self, sales: List[Sale]) -> List[int]:
+        """Save several prepared sales and reduce stock in a single transaction
+        
+        Stock is checked for the whole batch before anything is written, so
+        either every sale is recorded with its stock movements or none is.
+        """
+        required: Dict[int, int] = {}
+        for sale in sales:
+            if not sale.items:
+                raise ValueError("Cannot complete sale with no items")
+            if sale.cash_amount + sale.card_amount < sale.total_amount:
+                raise ValueError("Payment amount is insufficient")
+            for item in sale.items:
+                required[item.product_id] = required.get(item.product_id, 0) + item.quantity
+        
+        if not required:
+            return []
+        
+        movement_query = """
+            INSERT INTO stock_movements 
+            (product_id, movement_type, quantity_change, previous_stock, 
+             new_stock, user_id, reason, reference_id)
+            VALUES (?, 'sale', ?, ?, ?, ?, 'Sale transaction', ?)
+        """
+        placeholders = ",".join("?" * len(required))
+        
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            # BEGIN IMMEDIATE holds the write lock, so stock can't change between
+            # this check and the updates below
+            stock = {
+                row['id']: row['current_stock']
+                for row in cursor.execute(
+                    f"SELECT id, current_stock FROM products WHERE id IN ({placeholders})",
+                    tuple(required)
+                )
+            }
+            for product_id, quantity in required.items():
+                if product_id not in stock:
+                    raise ValueError(f"Product {product_id} not found")
+                if stock[product_id] < quantity:
+                    raise ValueError(
+                        f"Insufficient stock for product {product_id}. "
+                        f"Available: {stock[product_id]}, Required: {quantity}"
+                    )
+            
+            sale_ids = []
+            movements = []
+            for sale in sales:
+                sale_id = self._insert_sale(cursor, sale)
+                sale_ids.append(sale_id)
+                for item in sale.items:
+                    previous_stock = stock[item.product_id]
+                    new_stock = stock[item.product_id] = previous_stock - item.quantity
+                    movements.append((
+                        item.product_id, -item.quantity, previous_stock,
+                        new_stock, sale.user_id, sale_id
+                    ))
+            
+            cursor.executemany(
+                "UPDATE products SET current_stock = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                [(new_stock, product_id) for product_id, new_stock in stock.items()]
+            )
+            cursor.executemany(movement_query, movements)
+        
+        self.product_manager._invalidate_cache()
+        return sale_ids
     
     def void_sale(self, sale_id: int, user_id: int, reason: str) -> bool:
         """Void a completed sale and restore stock"""
@@ -334,6 +452,13 @@ class TransactionManager:
     
     def _save_sale_to_db(self) -> int:
         """Save current sale to database"""
+        with self.db.get_connection() as conn:
+            sale_id = self._insert_sale(conn.cursor(), self.current_sale)
+            conn.commit()
+        return sale_id
+    
+    def _insert_sale(self, cursor, sale: Sale) -> int:
+        """Insert a sale and its items on an open cursor without committing"""
         # Insert sale record
         sale_query = """
             INSERT INTO sales 
@@ -343,19 +468,20 @@ class TransactionManager:
         """
         
         sale_params = (
-            self.current_sale.transaction_ref,
-            self.current_sale.date_time,
-            self.current_sale.user_id,
-            self.current_sale.subtotal,
-            self.current_sale.vat_amount,
-            self.current_sale.total_amount,
-            self.current_sale.payment_method,
-            self.current_sale.cash_amount,
-            self.current_sale.card_amount,
-            self.current_sale.change_given
+            sale.transaction_ref,
+            sale.date_time,
+            sale.user_id,
+            sale.subtotal,
+            sale.vat_amount,
+            sale.total_amount,
+            sale.payment_method,
+            sale.cash_amount,
+            sale.card_amount,
+            sale.change_given
         )
         
-        sale_id = self.db.get_last_insert_id(sale_query, sale_params)
+        cursor.execute(sale_query, sale_params)
+        sale_id = cursor.lastrowid
         
         # Insert sale items
         item_query = """
@@ -364,11 +490,10 @@ class TransactionManager:
             VALUES (?, ?, ?, ?, ?, ?)
         """
         
-        for item in self.current_sale.items:
-            item_params = (
-                sale_id, item.product_id, item.quantity,
-                item.unit_price, item.total_price, item.vat_rate
-            )
-            self.db.execute_update(item_query, item_params)
+        cursor.executemany(item_query, [
+            (sale_id, item.product_id, item.quantity,
+             item.unit_price, item.total_price, item.vat_rate)
+            for item in sale.items
+        ])
         
         return sale_id
@@ -10,8 +10,9 @@ import os
 from datetime import datetime, date
 from typing import Optional
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Add project root to path when run directly as a script
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from core.products.management import ProductManager, Product
 from core.auth.authentication import get_auth_manager
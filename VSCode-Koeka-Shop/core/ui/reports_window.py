@@ -11,8 +11,9 @@ from datetime import datetime, date, timedelta
 from calendar import monthrange
 import tempfile
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Add project root to path when run directly as a script
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from core.sales.cash_management import get_cash_manager
 from core.auth.authentication import get_auth_manager
@@ -20,7 +21,7 @@ from core.database.connection import get_db_manager
 
 # Try to import optional modules
 try:
-    from modules.basic_reporting.daily_reports import DailyReportsManager
+    from modules.basic_reporting.daily_reports import DailyReportsManager, get_daily_reports_manager
 except ImportError:
     # Create a mock class if module not available
     class DailyReportsManager:
@@ -30,6 +31,11 @@ except ImportError:
             return {"error": "Daily reports module not available"}
         def get_monthly_summary(self, year, month):
             return {"error": "Monthly reports module not available"}
+        def format_summary_text(self, summary):
+            return str(summary)
+    
+    def get_daily_reports_manager():
+        return DailyReportsManager()
 
 class ReportsWindow:
     """Reports and analytics interface"""
@@ -43,7 +49,7 @@ class ReportsWindow:
         self.cash_manager = get_cash_manager()
         self.auth_manager = get_auth_manager()
         self.db = get_db_manager()
-        self.daily_reports = DailyReportsManager()
+        self.daily_reports = get_daily_reports_manager()
         
         # Initialize status_label as None for safety
         self.status_label = None
@@ -352,7 +358,7 @@ class ReportsWindow:
             sales_summary = self.daily_reports.generate_daily_sales_summary(report_date)
             
             # Combine reports
-            full_report = f"{cash_report}\n\n{sales_summary}"
+            full_report = f"{cash_report}\n\n{self.daily_reports.format_summary_text(sales_summary)}"
             
             # Display report
             self.daily_report_text.delete(1.0, tk.END)
@@ -9,8 +9,9 @@ import sys
 import os
 from datetime import datetime
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Add project root to path when run directly as a script
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from core.products.management import ProductManager
 from core.sales.transaction import TransactionManager
@@ -488,10 +489,7 @@ class SalesScreen:
                 return
             
             # Complete the sale
-            sale_id = self.transaction_manager.complete_sale()
-            
-            # Get completed sale for receipt
-            completed_sale = self.transaction_manager.get_sale_by_id(sale_id)
+            completed_sale = self.transaction_manager.complete_sale()
             
             if completed_sale:
                 # Store for receipt actions
@@ -4,8 +4,10 @@ Demonstrates core functionality through command-line interface
 """
 
 import os
+import queue
 import sys
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,6 +19,9 @@ from core.database.connection import get_db_manager
 from utils.helpers import hash_password
 from utils.validation import validate_price, validate_stock_quantity
 
+CATEGORIES = frozenset(ProductManager.CATEGORIES)
+PAYMENT_METHODS = frozenset({'cash', 'card', 'mixed'})
+
 class SimplePOSDemo:
     """Simple CLI demonstration of POS functionality"""
     
@@ -25,6 +30,20 @@ class SimplePOSDemo:
         self.transaction_manager = TransactionManager()
         self.receipt_generator = ReceiptGenerator()
         self.current_user_id = self._get_demo_user()
+        self._actions = {
+            "1": self.view_products,
+            "2": self.add_product,
+            "3": self.start_sale,
+            "4": self.view_sales_history,
+            "5": self.check_stock_levels,
+            "6": self.generate_test_receipt,
+            "7": self.view_sms_history,
+        }
+        
+        # SMS receipts are sent by a background worker so checkout never waits on the network
+        self._sms_queue = queue.Queue()
+        self._sms_status = queue.Queue()
+        threading.Thread(target=self._sms_worker, daemon=True).start()
     
     def _get_demo_user(self):
         """Get or create demo user"""
@@ -41,8 +60,35 @@ class SimplePOSDemo:
                 VALUES (?, ?, ?, ?)
             """, ("demo", password_hash, "admin", "Demo User"))
     
+    def _sms_worker(self):
+        """Send queued SMS receipts and post the outcome for the menu to report"""
+        while True:
+            sale, phone = self._sms_queue.get()
+            try:
+                from core.sales.sms_service import get_sms_service
+                result = get_sms_service().send_receipt_sms(sale, phone)
+                
+                if result['success']:
+                    self._sms_status.put(f" SMS receipt for {sale.transaction_ref} sent to "
+                                         f"{result.get('phone')} (Message ID: {result.get('message_id')})")
+                else:
+                    self._sms_status.put(f" Failed to send SMS for {sale.transaction_ref}: {result['error']}")
+            except Exception as e:
+                self._sms_status.put(f" SMS error: {e}")
+            finally:
+                self._sms_queue.task_done()
+    
+    def _show_sms_status(self):
+        """Print SMS outcomes reported by the worker since the last menu"""
+        while True:
+            try:
+                print(self._sms_status.get_nowait())
+            except queue.Empty:
+                break
+    
     def show_menu(self):
         """Display main menu"""
+        self._show_sms_status()
         print("\n" + "=" * 50)
         print(" TEMBIE'S SPAZA SHOP - POS DEMO")
         print("=" * 50)
@@ -69,10 +115,13 @@ class SimplePOSDemo:
             print("No products found. Add some products first!")
             return
         
-        for product in products:
-            stock_status = "️ LOW" if product.current_stock <= product.min_stock else ""
-            print(f"{product.id:<4} {product.name[:24]:<25} {product.barcode or 'N/A':<15} "
-                  f"R{product.sell_price:<7.2f} {product.current_stock:<4} {stock_status:<3} {product.category:<12}")
+        fmt = "{:<4} {:<25} {:<15} R{:<7.2f} {:<4} {:<3} {:<12}".format
+        sys.stdout.write("\n".join(
+            fmt(product.id, product.name[:24], product.barcode or 'N/A', product.sell_price,
+                product.current_stock, "️ LOW" if product.current_stock <= product.min_stock else "",
+                product.category)
+            for product in products
+        ) + "\n")
         
         print("-" * 80)
         print(f"Total products: {len(products)}")
@@ -92,7 +141,7 @@ class SimplePOSDemo:
             
             print("Categories: Food, Household, Sweets, Cooldrinks, Other")
             category = input("Category: ").strip()
-            if category not in ['Food', 'Household', 'Sweets', 'Cooldrinks', 'Other']:
+            if category not in CATEGORIES:
                 print(" Invalid category!")
                 return
             
@@ -146,6 +195,16 @@ class SimplePOSDemo:
             sale = self.transaction_manager.start_new_sale(self.current_user_id)
             print(f"Started sale: {sale.transaction_ref}")
             
+            # Handlers returning True end the sale loop
+            sale_actions = {
+                "1": self._add_item_by_id,
+                "2": self._add_item_by_barcode,
+                "3": self._view_current_sale,
+                "4": self._remove_item,
+                "5": self._complete_sale,
+                "0": self._cancel_sale,
+            }
+            
             while True:
                 print(f"\nCurrent sale total: R{sale.total_amount:.2f}")
                 print("Options:")
@@ -158,27 +217,21 @@ class SimplePOSDemo:
                 
                 choice = input("Choice: ").strip()
                 
-                if choice == "1":
-                    self._add_item_by_id()
-                elif choice == "2":
-                    self._add_item_by_barcode()
-                elif choice == "3":
-                    self._view_current_sale()
-                elif choice == "4":
-                    self._remove_item()
-                elif choice == "5":
-                    if self._complete_sale():
-                        break
-                elif choice == "0":
-                    self.transaction_manager.current_sale = None
-                    print(" Sale cancelled")
-                    break
-                else:
+                handler = sale_actions.get(choice)
+                if handler is None:
                     print(" Invalid choice!")
+                elif handler():
+                    break
                     
         except Exception as e:
             print(f" Error in sale: {e}")
     
+    def _cancel_sale(self):
+        """Discard the current sale"""
+        self.transaction_manager.current_sale = None
+        print(" Sale cancelled")
+        return True
+    
     def _add_item_by_id(self):
         """Add item to sale by product ID"""
         try:
@@ -250,7 +303,7 @@ class SimplePOSDemo:
         print("Payment methods: cash, card, mixed")
         
         payment_method = input("Payment method: ").strip().lower()
-        if payment_method not in ['cash', 'card', 'mixed']:
+        if payment_method not in PAYMENT_METHODS:
             print(" Invalid payment method!")
             return False
         
@@ -269,11 +322,10 @@ class SimplePOSDemo:
                 print(" Insufficient payment!")
                 return False
             
-            sale_id = self.transaction_manager.complete_sale()
-            print(f" Sale completed! ID: {sale_id}")
+            completed_sale = self.transaction_manager.complete_sale()
+            print(f" Sale completed! ID: {completed_sale.id}")
             
             # Show receipt
-            completed_sale = self.transaction_manager.get_sale_by_id(sale_id)
             if completed_sale:
                 print("\n RECEIPT")
                 print("=" * 50)
@@ -300,19 +352,23 @@ class SimplePOSDemo:
         
         db = get_db_manager()
         today = datetime.now().date()
+        tomorrow = today + timedelta(days=1)
         
         query = """
             SELECT s.id, s.transaction_ref, s.date_time, s.total_amount, s.payment_method,
-                   COUNT(si.id) as item_count
+                   strftime('%H:%M', s.date_time) as time_str,
+                   COUNT(si.id) as item_count,
+                   SUM(s.total_amount) OVER () as total_sales,
+                   COUNT(*) OVER () as sale_count
             FROM sales s
             LEFT JOIN sale_items si ON s.id = si.sale_id
-            WHERE DATE(s.date_time) = ? AND s.voided = 0
+            WHERE s.date_time >= ? AND s.date_time < ? AND s.voided = 0
             GROUP BY s.id
             ORDER BY s.date_time DESC
             LIMIT 10
         """
         
-        results = db.execute_query(query, (today.isoformat(),))
+        results = db.execute_query(query, (today.isoformat(), tomorrow.isoformat()))
         
         if not results:
             print("No sales found for today.")
@@ -321,16 +377,16 @@ class SimplePOSDemo:
         print(f"{'ID':<4} {'Transaction':<12} {'Time':<8} {'Items':<6} {'Total':<10} {'Payment':<8}")
         print("-" * 80)
         
-        for row in results:
-            time_str = row['date_time'].split(' ')[1][:5]  # Extract HH:MM
-            print(f"{row['id']:<4} {row['transaction_ref']:<12} {time_str:<8} "
-                  f"{row['item_count']:<6} R{row['total_amount']:<9.2f} {row['payment_method']:<8}")
+        fmt = "{:<4} {:<12} {:<8} {:<6} R{:<9.2f} {:<8}".format
+        sys.stdout.write("\n".join(
+            fmt(row['id'], row['transaction_ref'], row['time_str'], row['item_count'], row['total_amount'], row['payment_method'])
+            for row in results
+        ) + "\n")
         
         print("-" * 80)
         
-        # Calculate totals
-        total_sales = sum(row['total_amount'] for row in results)
-        print(f"Total sales today: R{total_sales:.2f} ({len(results)} transactions)")
+        totals = results[0]
+        print(f"Total sales today: R{totals['total_sales']:.2f} ({totals['sale_count']} transactions)")
     
     def check_stock_levels(self):
         """Check stock levels and show alerts"""
@@ -393,16 +449,13 @@ class SimplePOSDemo:
             
             try:
                 from core.sales.sms_service import get_sms_service
-                sms_service = get_sms_service()
                 
-                print(" Sending SMS receipt...")
-                result = sms_service.send_receipt_sms(sale, phone)
+                if not get_sms_service().validate_phone_number(phone):
+                    print(" Invalid phone number format. Please use format: 0XX XXX XXXX")
+                    return
                 
-                if result['success']:
-                    print(f" SMS receipt sent successfully to {result.get('phone')}!")
-                    print(f"   Message ID: {result.get('message_id')}")
-                else:
-                    print(f" Failed to send SMS: {result['error']}")
+                self._sms_queue.put((sale, phone))
+                print(" SMS receipt queued for sending")
                     
             except Exception as e:
                 print(f" SMS error: {e}")
@@ -416,7 +469,7 @@ class SimplePOSDemo:
             from core.sales.sms_service import get_sms_service
             sms_service = get_sms_service()
             
-            history = sms_service.get_sms_history(limit=20)
+            history = sms_service.get_sms_history_for_display(limit=20)
             
             if not history:
                 print("No SMS history found.")
@@ -425,12 +478,12 @@ class SimplePOSDemo:
             print(f"{'Date/Time':<20} {'Phone':<15} {'Transaction':<12} {'Status':<8} {'Error':<30}")
             print("-" * 80)
             
-            for entry in history:
-                status = " Sent" if entry['success'] else " Failed"
-                error = entry['error_message'][:28] + "..." if entry['error_message'] and len(entry['error_message']) > 30 else entry['error_message'] or ""
-                
-                print(f"{entry['sent_at'][:19]:<20} {entry['phone_number']:<15} "
-                      f"{entry['transaction_ref']:<12} {status:<8} {error:<30}")
+            fmt = "{:<20} {:<15} {:<12} {:<8} {:<30}".format
+            sys.stdout.write("\n".join(
+                fmt(entry['sent_at'], entry['phone_number'], entry['transaction_ref'],
+                    " Sent" if entry['success'] else " Failed", entry['error'])
+                for entry in history
+            ) + "\n")
             
             print("-" * 80)
             print(f"Total SMS attempts: {len(history)}")
@@ -448,23 +501,16 @@ class SimplePOSDemo:
                 self.show_menu()
                 choice = input("\nSelect option: ").strip()
                 
-                if choice == "1":
-                    self.view_products()
-                elif choice == "2":
-                    self.add_product()
-                elif choice == "3":
-                    self.start_sale()
-                elif choice == "4":
-                    self.view_sales_history()
-                elif choice == "5":
-                    self.check_stock_levels()
-                elif choice == "6":
-                    self.generate_test_receipt()
-                elif choice == "7":
-                    self.view_sms_history()
-                elif choice == "0":
+                if choice == "0":
+                    # Let queued SMS receipts finish before the daemon worker is torn down
+                    self._sms_queue.join()
+                    self._show_sms_status()
                     print("\n Thank you for using Tembie's Spaza Shop POS!")
                     break
+                
+                handler = self._actions.get(choice)
+                if handler:
+                    handler()
                 else:
                     print(" Invalid choice! Please try again.")
                     
@@ -8,10 +8,55 @@ from tkinter import ttk, messagebox, filedialog
 import subprocess
 import sys
 import os
+import importlib.util
+import queue
 import threading
+from collections import deque
 from pathlib import Path
 import shutil
 
+# System check facts that cannot change while the wizard is running
+_PYTHON_VERSION = f"Python {sys.version.split()[0]}"
+_PIP_AVAILABLE = importlib.util.find_spec('pip') is not None
+
+WELCOME_TEXT = """This wizard will guide you through the installation of the Koeka Shop Point of Sale system.
+
+This system provides:
+• Complete POS transaction processing
+• Product and inventory management  
+• Daily cash management and reporting
+• Monthly financial reports
+• User management with role-based access
+
+The installation will:
+• Check system requirements
+• Install Python dependencies
+• Set up the database
+• Create desktop shortcuts
+• Configure demo data
+
+Click Next to continue."""
+
+OPTIONS_INFO_TEXT = """Demo data includes:
+• Sample products in different categories
+• Demo user account (admin/admin123)
+• Test transactions for reporting
+
+This is recommended for first-time users to explore the system."""
+
+COMPLETE_TEXT = """Koeka Shop POS has been successfully installed!
+
+You can now start the application by:
+• Using the desktop shortcut
+• Running 'python app.py' from the installation folder
+• Using the Start Menu shortcut
+
+Demo login credentials:
+Username: admin
+Password: admin123
+
+For support and documentation, refer to the README.md file in the installation folder."""
+
 class InstallationWizard:
     def __init__(self):
         self.root = tk.Tk()
@@ -24,16 +69,36 @@ class InstallationWizard:
         self.create_shortcuts = tk.BooleanVar(value=True)
         self.create_demo_data = tk.BooleanVar(value=True)
         
-        # Current step
+        # Log lines and the latest status queued by the installer thread, applied to
+        # the widgets in batches by _flush_log
+        self._log_queue = deque()
+        self._pending_status = None
+        self._log_pending = False
+        
+        # Single long-lived worker for background jobs (installation runs, retries)
+        self._work_q = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+        
+        # Free disk space in MB, measured once for the system check page
+        try:
+            self._free_space_mb = shutil.disk_usage('.').free / (1024 * 1024)
+        except OSError:
+            self._free_space_mb = None
+        
+        # Current step; each step's frame is built on first visit and reused afterwards
         self.current_step = 0
-        self.steps = [
-            ("Welcome", self.create_welcome_page),
-            ("System Check", self.create_system_check_page),
-            ("Installation Path", self.create_path_page),
-            ("Options", self.create_options_page),
-            ("Installation", self.create_install_page),
-            ("Complete", self.create_complete_page)
-        ]
+        self._step_frames = {}
+        self._current_frame = None
+        self._step_funcs = (
+            self.create_welcome_page,        # Welcome
+            self.create_system_check_page,   # System Check
+            self.create_path_page,           # Installation Path
+            self.create_options_page,        # Options
+            self.create_install_page,        # Installation
+            self.create_complete_page,       # Complete
+        )
+        self._num_steps = len(self._step_funcs)
         
         self.setup_ui()
         
@@ -50,7 +115,7 @@ class InstallationWizard:
         
         # Progress bar
         self.progress = ttk.Progressbar(self.root, mode='determinate', 
-                                       maximum=len(self.steps)-1)
+                                       maximum=self._num_steps-1)
         self.progress.pack(fill='x', padx=20, pady=10)
         
         # Main content frame
@@ -78,93 +143,64 @@ class InstallationWizard:
         
     def show_step(self):
         """Display the current step"""
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Hide the previous step
+        if self._current_frame is not None:
+            self._current_frame.pack_forget()
             
         # Update progress
         self.progress['value'] = self.current_step
         
         # Show current step
-        step_name, step_func = self.steps[self.current_step]
-        step_func()
+        frame = self._step_frames.get(self.current_step)
+        if frame is None:
+            frame = self._step_frames[self.current_step] = tk.Frame(self.content_frame)
+            self._step_funcs[self.current_step](frame)
+        frame.pack(fill='both', expand=True)
+        self._current_frame = frame
         
         # Update buttons
         self.back_button['state'] = 'normal' if self.current_step > 0 else 'disabled'
         
-        if self.current_step == len(self.steps) - 1:
+        if self.current_step == self._num_steps - 1:
             self.next_button['text'] = "Finish"
-        elif self.current_step == len(self.steps) - 2:  # Installation step
+        elif self.current_step == self._num_steps - 2:  # Installation step
             self.next_button['text'] = "Install"
         else:
             self.next_button['text'] = "Next >"
             
-    def create_welcome_page(self):
+    def create_welcome_page(self, parent):
         """Welcome page"""
-        tk.Label(self.content_frame, text="Welcome to Koeka Shop POS", 
+        tk.Label(parent, text="Welcome to Koeka Shop POS", 
                 font=('Arial', 14, 'bold')).pack(pady=20)
         
-        welcome_text = """This wizard will guide you through the installation of the Koeka Shop Point of Sale system.
-
-This system provides:
-• Complete POS transaction processing
-• Product and inventory management  
-• Daily cash management and reporting
-• Monthly financial reports
-• User management with role-based access
-
-The installation will:
-• Check system requirements
-• Install Python dependencies
-• Set up the database
-• Create desktop shortcuts
-• Configure demo data
-
-Click Next to continue."""
-
-        tk.Label(self.content_frame, text=welcome_text, justify='left', 
+        tk.Label(parent, text=WELCOME_TEXT, justify='left', 
                 wraplength=500).pack(pady=20, anchor='w')
                 
-    def create_system_check_page(self):
+    def create_system_check_page(self, parent):
         """System requirements check"""
-        tk.Label(self.content_frame, text="System Requirements Check", 
+        tk.Label(parent, text="System Requirements Check", 
                 font=('Arial', 14, 'bold')).pack(pady=20)
         
         # Create check results frame
-        results_frame = tk.Frame(self.content_frame)
+        results_frame = tk.Frame(parent)
         results_frame.pack(fill='both', expand=True)
         
         # Python check
         python_frame = tk.Frame(results_frame)
         python_frame.pack(fill='x', pady=5)
         
-        try:
-            result = subprocess.run([sys.executable, '--version'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                tk.Label(python_frame, text="✓", fg='green', font=('Arial', 12, 'bold')).pack(side='left')
-                tk.Label(python_frame, text=f"Python: {result.stdout.strip()}").pack(side='left', padx=(10, 0))
-            else:
-                tk.Label(python_frame, text="✗", fg='red', font=('Arial', 12, 'bold')).pack(side='left')
-                tk.Label(python_frame, text="Python: Not found").pack(side='left', padx=(10, 0))
-        except:
-            tk.Label(python_frame, text="✗", fg='red', font=('Arial', 12, 'bold')).pack(side='left')
-            tk.Label(python_frame, text="Python: Not found").pack(side='left', padx=(10, 0))
+        # The wizard itself is running on this interpreter
+        tk.Label(python_frame, text="✓", fg='green', font=('Arial', 12, 'bold')).pack(side='left')
+        tk.Label(python_frame, text=f"Python: {_PYTHON_VERSION}").pack(side='left', padx=(10, 0))
         
         # Pip check
         pip_frame = tk.Frame(results_frame)
         pip_frame.pack(fill='x', pady=5)
         
-        try:
-            result = subprocess.run([sys.executable, '-m', 'pip', '--version'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                tk.Label(pip_frame, text="✓", fg='green', font=('Arial', 12, 'bold')).pack(side='left')
-                tk.Label(pip_frame, text="Package installer (pip): Available").pack(side='left', padx=(10, 0))
-            else:
-                tk.Label(pip_frame, text="✗", fg='red', font=('Arial', 12, 'bold')).pack(side='left')
-                tk.Label(pip_frame, text="Package installer (pip): Not available").pack(side='left', padx=(10, 0))
-        except:
+        if _PIP_AVAILABLE:
+            tk.Label(pip_frame, text="✓", fg='green', font=('Arial', 12, 'bold')).pack(side='left')
+            tk.Label(pip_frame, text="Package installer (pip): Available").pack(side='left', padx=(10, 0))
+        else:
             tk.Label(pip_frame, text="✗", fg='red', font=('Arial', 12, 'bold')).pack(side='left')
             tk.Label(pip_frame, text="Package installer (pip): Not available").pack(side='left', padx=(10, 0))
         
@@ -172,97 +208,77 @@ Click Next to continue."""
         disk_frame = tk.Frame(results_frame)
         disk_frame.pack(fill='x', pady=5)
         
-        try:
-            statvfs = os.statvfs('.')
-            free_space = statvfs.f_frsize * statvfs.f_bavail / (1024 * 1024)  # MB
-            if free_space > 100:  # Need at least 100MB
-                tk.Label(disk_frame, text="✓", fg='green', font=('Arial', 12, 'bold')).pack(side='left')
-                tk.Label(disk_frame, text=f"Disk space: {free_space:.0f} MB available").pack(side='left', padx=(10, 0))
-            else:
-                tk.Label(disk_frame, text="✗", fg='red', font=('Arial', 12, 'bold')).pack(side='left')
-                tk.Label(disk_frame, text="Disk space: Insufficient (need 100MB)").pack(side='left', padx=(10, 0))
-        except:
+        free_space = self._free_space_mb
+        if free_space is None:
             tk.Label(disk_frame, text="?", fg='orange', font=('Arial', 12, 'bold')).pack(side='left')
             tk.Label(disk_frame, text="Disk space: Unable to check").pack(side='left', padx=(10, 0))
+        elif free_space > 100:  # Need at least 100MB
+            tk.Label(disk_frame, text="✓", fg='green', font=('Arial', 12, 'bold')).pack(side='left')
+            tk.Label(disk_frame, text=f"Disk space: {free_space:.0f} MB available").pack(side='left', padx=(10, 0))
+        else:
+            tk.Label(disk_frame, text="✗", fg='red', font=('Arial', 12, 'bold')).pack(side='left')
+            tk.Label(disk_frame, text="Disk space: Insufficient (need 100MB)").pack(side='left', padx=(10, 0))
             
-    def create_path_page(self):
+    def create_path_page(self, parent):
         """Installation path selection"""
-        tk.Label(self.content_frame, text="Installation Location", 
+        tk.Label(parent, text="Installation Location", 
                 font=('Arial', 14, 'bold')).pack(pady=20)
         
-        tk.Label(self.content_frame, text="Choose where to install Koeka Shop POS:").pack(anchor='w')
+        tk.Label(parent, text="Choose where to install Koeka Shop POS:").pack(anchor='w')
         
-        path_frame = tk.Frame(self.content_frame)
+        path_frame = tk.Frame(parent)
         path_frame.pack(fill='x', pady=10)
         
         tk.Entry(path_frame, textvariable=self.install_path, width=60).pack(side='left', fill='x', expand=True)
         tk.Button(path_frame, text="Browse...", command=self.browse_path).pack(side='right', padx=(10, 0))
         
-        tk.Label(self.content_frame, text="Note: The application will be installed in this folder.", 
+        tk.Label(parent, text="Note: The application will be installed in this folder.", 
                 fg='gray').pack(anchor='w', pady=(10, 0))
                 
-    def create_options_page(self):
+    def create_options_page(self, parent):
         """Installation options"""
-        tk.Label(self.content_frame, text="Installation Options", 
+        tk.Label(parent, text="Installation Options", 
                 font=('Arial', 14, 'bold')).pack(pady=20)
         
-        tk.Checkbutton(self.content_frame, text="Create desktop and start menu shortcuts", 
+        tk.Checkbutton(parent, text="Create desktop and start menu shortcuts", 
                       variable=self.create_shortcuts).pack(anchor='w', pady=5)
         
-        tk.Checkbutton(self.content_frame, text="Create demo data for testing", 
+        tk.Checkbutton(parent, text="Create demo data for testing", 
                       variable=self.create_demo_data).pack(anchor='w', pady=5)
         
-        info_text = """Demo data includes:
-• Sample products in different categories
-• Demo user account (admin/admin123)
-• Test transactions for reporting
-
-This is recommended for first-time users to explore the system."""
-        
-        tk.Label(self.content_frame, text=info_text, justify='left', 
+        tk.Label(parent, text=OPTIONS_INFO_TEXT, justify='left', 
                 wraplength=500, fg='gray').pack(anchor='w', pady=(10, 0))
                 
-    def create_install_page(self):
+    def create_install_page(self, parent):
         """Installation progress page"""
-        tk.Label(self.content_frame, text="Installing Koeka Shop POS", 
+        tk.Label(parent, text="Installing Koeka Shop POS", 
                 font=('Arial', 14, 'bold')).pack(pady=20)
         
-        self.install_progress = ttk.Progressbar(self.content_frame, mode='indeterminate')
+        self.install_progress = ttk.Progressbar(parent, mode='indeterminate')
         self.install_progress.pack(fill='x', pady=10)
         
-        self.install_status = tk.Label(self.content_frame, text="Ready to install...")
+        self._status_var = tk.StringVar(value="Ready to install...")
+        self.install_status = tk.Label(parent, textvariable=self._status_var)
         self.install_status.pack(pady=10)
         
         # Text area for installation log
-        log_frame = tk.Frame(self.content_frame)
+        log_frame = tk.Frame(parent)
         log_frame.pack(fill='both', expand=True, pady=10)
         
-        self.install_log = tk.Text(log_frame, height=15, wrap='word')
+        # Read-only except while _flush_log writes a batch
+        self.install_log = tk.Text(log_frame, height=15, wrap='word', state='disabled')
         scrollbar = tk.Scrollbar(log_frame, orient='vertical', command=self.install_log.yview)
         self.install_log.configure(yscrollcommand=scrollbar.set)
         
         self.install_log.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
-    def create_complete_page(self):
+    def create_complete_page(self, parent):
         """Installation complete page"""
-        tk.Label(self.content_frame, text="Installation Complete!", 
+        tk.Label(parent, text="Installation Complete!", 
                 font=('Arial', 14, 'bold'), fg='green').pack(pady=20)
         
-        complete_text = """Koeka Shop POS has been successfully installed!
-
-You can now start the application by:
-• Using the desktop shortcut
-• Running 'python app.py' from the installation folder
-• Using the Start Menu shortcut
-
-Demo login credentials:
-Username: admin
-Password: admin123
-
-For support and documentation, refer to the README.md file in the installation folder."""
-
-        tk.Label(self.content_frame, text=complete_text, justify='left', 
+        tk.Label(parent, text=COMPLETE_TEXT, justify='left', 
                 wraplength=500).pack(pady=20)
                 
         self.next_button.configure(command=self.finish_install)
@@ -275,9 +291,9 @@ For support and documentation, refer to the README.md file in the installation f
             
     def go_next(self):
         """Go to next step"""
-        if self.current_step == len(self.steps) - 2:  # Installation step
+        if self.current_step == self._num_steps - 2:  # Installation step
             self.start_installation()
-        elif self.current_step < len(self.steps) - 1:
+        elif self.current_step < self._num_steps - 1:
             self.current_step += 1
             self.show_step()
         else:
@@ -295,8 +311,14 @@ For support and documentation, refer to the README.md file in the installation f
         self.back_button['state'] = 'disabled'
         self.install_progress.start()
         
-        # Run installation in separate thread
-        threading.Thread(target=self.run_installation, daemon=True).start()
+        # Run installation on the worker thread
+        self._work_q.put(self.run_installation)
+        
+    def _worker_loop(self):
+        """Run queued jobs one at a time"""
+        while True:
+            job = self._work_q.get()
+            job()
         
     def run_installation(self):
         """Run the actual installation"""
@@ -307,42 +329,44 @@ For support and documentation, refer to the README.md file in the installation f
             self.update_status("Installing Python dependencies...")
             self.log_message("Installing requirements...")
             
-            result = subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'],
-                                  capture_output=True, text=True, cwd=self.install_path.get())
+            # Stream pip output into the log as it arrives
+            proc = subprocess.Popen([sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check',
+                                     '--no-input', '--no-color', '-q', '-r', 'requirements.txt'],
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                    bufsize=1, cwd=self.install_path.get())
+            for line in proc.stdout:
+                self.log_message(line.rstrip())
             
-            if result.returncode == 0:
+            if proc.wait() == 0:
                 self.log_message("Dependencies installed successfully")
             else:
-                self.log_message(f"Error installing dependencies: {result.stderr}")
+                self.log_message("Error installing dependencies (see output above)")
                 raise Exception("Failed to install dependencies")
             
-            # Step 2: Setup database
+            # Step 2: Setup database in the installation folder. The path is made
+            # absolute so it doesn't depend on the wizard's working directory.
             self.update_status("Setting up database...")
             self.log_message("Initializing database...")
-            
-            result = subprocess.run([sys.executable, '-c', 
-                                   "from core.database.connection import get_db_manager; get_db_manager().initialize_schema()"],
-                                  capture_output=True, text=True, cwd=self.install_path.get())
-            
-            if result.returncode == 0:
-                self.log_message("Database setup complete")
-            else:
-                self.log_message(f"Error setting up database: {result.stderr}")
+            install_dir = os.path.abspath(self.install_path.get())
+            sys.path.insert(0, install_dir)
+            try:
+                from core.database.connection import set_db_path
+                set_db_path(os.path.join(install_dir, 'spaza_shop.db'))
+            except Exception as e:
+                self.log_message(f"Error setting up database: {e}")
                 raise Exception("Failed to setup database")
+            self.log_message("Database setup complete")
             
             # Step 3: Create demo data
             if self.create_demo_data.get():
                 self.update_status("Creating demo data...")
-                self.log_message("Setting up demo user and data...")
-                
-                result = subprocess.run([sys.executable, '-c', 
-                                       "from core.auth.authentication import ensure_demo_user; ensure_demo_user()"],
-                                      capture_output=True, text=True, cwd=self.install_path.get())
-                
-                if result.returncode == 0:
+                self.log_message("Creating demo user...")
+                try:
+                    from core.auth.authentication import ensure_demo_user
+                    ensure_demo_user()
                     self.log_message("Demo data created")
-                else:
-                    self.log_message(f"Warning: Could not create demo data: {result.stderr}")
+                except Exception as e:
+                    self.log_message(f"Warning: Could not create demo data: {e}")
             
             # Step 4: Create shortcuts
             if self.create_shortcuts.get():
@@ -378,19 +402,37 @@ For support and documentation, refer to the README.md file in the installation f
                            "The installation failed. Please check the log for details.")
                            
     def log_message(self, message):
-        """Add message to installation log"""
-        def update_log():
-            self.install_log.insert('end', f"{message}\n")
-            self.install_log.see('end')
-        
-        self.root.after(0, update_log)
+        """Queue a message for the installation log"""
+        self._log_queue.append(message)
+        self._schedule_flush()
         
     def update_status(self, status):
-        """Update installation status"""
-        def update():
-            self.install_status['text'] = status
-        
-        self.root.after(0, update)
+        """Queue an installation status update (only the latest one is shown)"""
+        self._pending_status = status
+        self._schedule_flush()
+        
+    def _schedule_flush(self):
+        """Arrange for queued log and status updates to be applied on the Tk thread"""
+        if not self._log_pending:
+            self._log_pending = True
+            self.root.after(50, self._flush_log)
+            
+    def _flush_log(self):
+        """Write all queued log messages with a single Text insert and apply the latest status"""
+        self._log_pending = False
+        status, self._pending_status = self._pending_status, None
+        if status is not None:
+            self._status_var.set(status)
+        
+        batch = []
+        while self._log_queue:
+            batch.append(self._log_queue.popleft())
+        
+        if batch:
+            self.install_log.configure(state='normal')
+            self.install_log.insert('end', '\n'.join(batch) + '\n')
+            self.install_log.configure(state='disabled')
+            self.install_log.see('end')
         
     def cancel_install(self):
         """Cancel installation"""
@@ -404,11 +446,8 @@ For support and documentation, refer to the README.md file in the installation f
         
     def run(self):
         """Run the installation wizard"""
-        # Center the window
-        self.root.update_idletasks()
-        x = (self.root.winfo_screenwidth() - self.root.winfo_width()) // 2
-        y = (self.root.winfo_screenheight() - self.root.winfo_height()) // 2
-        self.root.geometry(f"+{x}+{y}")
+        # Center the window using Tk's own placement helper
+        self.root.eval(f'tk::PlaceWindow {self.root} center')
         
         self.root.mainloop()
 
@@ -1 +1,19 @@
 # Basic reporting module
+
+import functools
+
+def safe_report(description, default):
+    """Decorate a report method so failures are printed and a fallback is returned
+    
+    default is called with the method's arguments to build the fallback value.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                print(f"Error {description}: {e}")
+                return default(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -3,197 +3,238 @@ Daily Reports Manager for Tembie's Spaza Shop POS System
 Handles daily sales reporting and analytics
 """
 
-import sqlite3
-from datetime import datetime, date
-import sys
-import os
-
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from datetime import datetime, date, timedelta
+import copy
 
 from core.database.connection import get_db_manager
+from modules.basic_reporting import safe_report
+
+def _empty_sales_summary(report_date):
+    """Sales summary returned when the report cannot be generated"""
+    return {
+        'date': report_date,
+        'transaction_count': 0,
+        'total_sales': 0.0,
+        'total_vat': 0.0,
+        'avg_sale_value': 0.0,
+        'payment_methods': [],
+        'top_products': []
+    }
 
 class DailyReportsManager:
     """Manager for daily reporting functionality"""
     
     def __init__(self):
         self.db_manager = get_db_manager()
+        # Report results keyed by (report, date); dropped whenever data is committed
+        self._cache = {}
+        self._cache_signature = None
         
+    def _db_signature(self):
+        """Database write version, used to detect commits since the cache was filled"""
+        return self.db_manager.data_version()
+    
+    def _cache_get(self, key):
+        """Return a copy of a cached report, clearing the cache first if the database changed"""
+        signature = self._db_signature()
+        if signature != self._cache_signature:
+            self._cache.clear()
+            self._cache_signature = signature
+        cached = self._cache.get(key)
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    def _cache_put(self, key, report):
+        """Cache a private copy of a report so callers may modify the one they get"""
+        self._cache[key] = copy.deepcopy(report)
+        return report
+    
+    @safe_report("generating daily sales summary", _empty_sales_summary)
     def generate_daily_sales_summary(self, report_date):
         """Generate daily sales summary for a specific date"""
-        try:
-            if isinstance(report_date, str):
-                # Convert string to date object
-                report_date = datetime.strptime(report_date, '%Y-%m-%d').date()
-            elif isinstance(report_date, datetime):
-                report_date = report_date.date()
-                
-            # Get sales summary for the date
-            sales_query = """
-                SELECT 
-                    COUNT(*) as transaction_count,
-                    SUM(total_amount) as total_sales,
-                    SUM(vat_amount) as total_vat,
-                    AVG(total_amount) as avg_sale_value
-                FROM sales 
-                WHERE DATE(date_time) = ?
-            """
+        if isinstance(report_date, str):
+            # Convert string to date object
+            report_date = datetime.strptime(report_date, '%Y-%m-%d').date()
+        elif isinstance(report_date, datetime):
+            report_date = report_date.date()
             
-            sales_data = self.db_manager.execute_query(sales_query, (report_date.strftime('%Y-%m-%d'),))
-            sales_row = sales_data[0] if sales_data else (0, 0, 0, 0)
-            
-            # Get payment method breakdown
-            payment_query = """
-                SELECT 
-                    payment_method,
-                    COUNT(*) as count,
-                    SUM(total_amount) as total
-                FROM sales 
-                WHERE DATE(date_time) = ?
-                GROUP BY payment_method
-            """
-            
-            payment_methods = self.db_manager.execute_query(payment_query, (report_date.strftime('%Y-%m-%d'),))
-            
-            # Get top selling products
-            products_query = """
-                SELECT 
-                    p.name,
-                    SUM(si.quantity) as quantity_sold,
-                    SUM(si.total_price) as revenue
-                FROM sale_items si
-                JOIN products p ON si.product_id = p.id
-                JOIN sales s ON si.sale_id = s.id
-                WHERE DATE(s.date_time) = ?
-                GROUP BY p.id, p.name
-                ORDER BY quantity_sold DESC
-                LIMIT 10
-            """
+        date_str = report_date.isoformat()
+        cached = self._cache_get(('summary', date_str))
+        if cached is not None:
+            return cached
             
-            top_products = self.db_manager.execute_query(products_query, (report_date.strftime('%Y-%m-%d'),))
-            
-            # Format results
-            summary = {
-                'date': report_date,
-                'transaction_count': sales_row[0] or 0,
-                'total_sales': sales_row[1] or 0.0,
-                'total_vat': sales_row[2] or 0.0,
-                'avg_sale_value': sales_row[3] or 0.0,
-                'payment_methods': [
-                    {
-                        'method': pm[0],
-                        'count': pm[1],
-                        'total': pm[2]
-                    } for pm in payment_methods
-                ],
-                'top_products': [
-                    {
-                        'name': tp[0],
-                        'quantity_sold': tp[1],
-                        'revenue': tp[2]
-                    } for tp in top_products
-                ]
-            }
-            
-            return summary
-            
-        except Exception as e:
-            print(f"Error generating daily sales summary: {e}")
-            return {
-                'date': report_date,
-                'transaction_count': 0,
-                'total_sales': 0.0,
-                'total_vat': 0.0,
-                'avg_sale_value': 0.0,
-                'payment_methods': [],
-                'top_products': []
-            }
+        # Half-open range on date_time so the sales date index can be used
+        params = (date_str, (report_date + timedelta(days=1)).isoformat())
+        
+        # Get sales summary for the date
+        sales_query = """
+            SELECT 
+                COUNT(*) as transaction_count,
+                SUM(total_amount) as total_sales,
+                SUM(vat_amount) as total_vat,
+                AVG(total_amount) as avg_sale_value
+            FROM sales 
+            WHERE date_time >= ? AND date_time < ?
+        """
+        
+        # Get payment method breakdown
+        payment_query = """
+            SELECT 
+                payment_method as method,
+                COUNT(*) as count,
+                SUM(total_amount) as total
+            FROM sales 
+            WHERE date_time >= ? AND date_time < ?
+            GROUP BY payment_method
+        """
+        
+        # Get top selling products, driven from the date-indexed sales rows
+        products_query = """
+            SELECT 
+                p.name,
+                SUM(si.quantity) as quantity_sold,
+                SUM(si.total_price) as revenue
+            FROM sales s
+            JOIN sale_items si ON si.sale_id = s.id
+            JOIN products p ON p.id = si.product_id
+            WHERE s.date_time >= ? AND s.date_time < ?
+            GROUP BY si.product_id
+            ORDER BY quantity_sold DESC
+            LIMIT 10
+        """
+        
+        # One connection and read transaction, so the totals, payment split and
+        # top products all describe the same set of sales
+        sales_data, payment_methods, top_products = self.db_manager.execute_many_queries([
+            (sales_query, params),
+            (payment_query, params),
+            (products_query, params),
+        ])
+        sales_row = sales_data[0] if sales_data else (0, 0, 0, 0)
+        
+        # Format results
+        summary = {
+            'date': report_date,
+            'transaction_count': sales_row[0] or 0,
+            'total_sales': sales_row[1] or 0.0,
+            'total_vat': sales_row[2] or 0.0,
+            'avg_sale_value': sales_row[3] or 0.0,
+            # Column aliases match the report keys, so rows map straight to dicts
+            'payment_methods': [dict(pm) for pm in payment_methods],
+            'top_products': [dict(tp) for tp in top_products]
+        }
+        
+        return self._cache_put(('summary', date_str), summary)
     
+    @safe_report("generating daily cash report", lambda report_date: None)
     def get_daily_cash_report(self, report_date):
         """Get daily cash management report"""
-        try:
-            if isinstance(report_date, str):
-                report_date = datetime.strptime(report_date, '%Y-%m-%d').date()
-            elif isinstance(report_date, datetime):
-                report_date = report_date.date()
-                
-            # Get cash management data
-            cash_query = """
+        if isinstance(report_date, str):
+            report_date = datetime.strptime(report_date, '%Y-%m-%d').date()
+        elif isinstance(report_date, datetime):
+            report_date = report_date.date()
+            
+        date_str = report_date.isoformat()
+        cached = self._cache_get(('cash', date_str))
+        if cached is not None:
+            return cached
+            
+        # Get cash management data; NULLs and the closing arithmetic are resolved in SQL
+        cash_query = """
+            SELECT 
+                opening_amount,
+                cash_sales,
+                card_sales,
+                withdrawals,
+                expected_closing,
+                actual_closing,
+                actual_closing - expected_closing as variance
+            FROM (
                 SELECT 
-                    opening_amount,
-                    cash_sales,
-                    card_sales,
-                    withdrawals,
-                    closing_count
+                    COALESCE(opening_amount, 0) as opening_amount,
+                    COALESCE(cash_sales, 0) as cash_sales,
+                    COALESCE(card_sales, 0) as card_sales,
+                    COALESCE(withdrawals, 0) as withdrawals,
+                    COALESCE(opening_amount, 0) + COALESCE(cash_sales, 0)
+                        - COALESCE(withdrawals, 0) as expected_closing,
+                    COALESCE(actual_closing, 0) as actual_closing
                 FROM daily_cash 
                 WHERE date = ?
-            """
-            
-            cash_data = self.db_manager.execute_query(cash_query, (report_date.strftime('%Y-%m-%d'),))
-            
-            if cash_data:
-                cash_row = cash_data[0]
-                expected_closing = (cash_row[0] or 0) + (cash_row[1] or 0) - (cash_row[3] or 0)
-                variance = (cash_row[4] or 0) - expected_closing
-                
-                return {
-                    'date': report_date,
-                    'opening_amount': cash_row[0] or 0,
-                    'cash_sales': cash_row[1] or 0,
-                    'card_sales': cash_row[2] or 0,
-                    'withdrawals': cash_row[3] or 0,
-                    'expected_closing': expected_closing,
-                    'actual_closing': cash_row[4] or 0,
-                    'variance': variance
-                }
-            else:
-                return {
-                    'date': report_date,
-                    'opening_amount': 0,
-                    'cash_sales': 0,
-                    'card_sales': 0,
-                    'withdrawals': 0,
-                    'expected_closing': 0,
-                    'actual_closing': 0,
-                    'variance': 0
-                }
-                
-        except Exception as e:
-            print(f"Error generating daily cash report: {e}")
-            return None
+            )
+        """
+        
+        cash_data = self.db_manager.execute_query(cash_query, (date_str,))
+        
+        if cash_data:
+            report = {'date': report_date, **cash_data[0]}
+        else:
+            report = {
+                'date': report_date,
+                'opening_amount': 0,
+                'cash_sales': 0,
+                'card_sales': 0,
+                'withdrawals': 0,
+                'expected_closing': 0,
+                'actual_closing': 0,
+                'variance': 0
+            }
+        
+        return self._cache_put(('cash', date_str), report)
     
+    @safe_report("getting stock alerts", lambda report_date=None: [])
     def get_stock_alerts(self, report_date=None):
         """Get low stock alerts for reporting"""
-        try:
-            # Get products with low stock
-            stock_query = """
-                SELECT 
-                    name,
-                    current_stock,
-                    min_stock,
-                    category
-                FROM products 
-                WHERE current_stock <= min_stock AND current_stock >= 0
-                ORDER BY (current_stock - min_stock) ASC
-            """
-            
-            low_stock_items = self.db_manager.execute_query(stock_query)
-            
-            return [
-                {
-                    'name': item[0],
-                    'current_stock': item[1],
-                    'min_stock': item[2],
-                    'category': item[3],
-                    'deficit': item[2] - item[1]
-                } for item in low_stock_items
-            ]
+        cached = self._cache_get(('stock_alerts', None))
+        if cached is not None:
+            return cached
             
-        except Exception as e:
-            print(f"Error getting stock alerts: {e}")
-            return []
+        # Get products with low stock
+        stock_query = """
+            SELECT 
+                name,
+                current_stock,
+                min_stock,
+                category,
+                (min_stock - current_stock) as deficit
+            FROM products 
+            WHERE current_stock <= min_stock AND current_stock >= 0
+            ORDER BY deficit DESC
+        """
+        
+        alerts = [dict(item) for item in self.db_manager.execute_query_iter(stock_query)]
+        
+        return self._cache_put(('stock_alerts', None), alerts)
+    
+    def format_summary_text(self, summary):
+        """Render a sales summary from generate_daily_sales_summary as report text"""
+        report_lines = [
+            "=" * 60,
+            f"DAILY SALES SUMMARY - {summary['date']}".center(60),
+            "=" * 60,
+            "",
+            "SALES:",
+            f"  Transactions:            {summary['transaction_count']:>11}",
+            f"  Total Sales:             R{summary['total_sales']:>10.2f}",
+            f"  VAT Included:            R{summary['total_vat']:>10.2f}",
+            f"  Average Sale:            R{summary['avg_sale_value']:>10.2f}",
+            "",
+            "PAYMENT METHODS:",
+            *[f"  {pm['method'].title():<10} {pm['count']:>5} sales   R{pm['total']:>10.2f}"
+              for pm in summary['payment_methods']],
+            "",
+            "TOP PRODUCTS:",
+            *[f"  {tp['name'][:30]:<30} {tp['quantity_sold']:>5}   R{tp['revenue']:>10.2f}"
+              for tp in summary['top_products']],
+            "=" * 60,
+        ]
+        
+        return "\n".join(report_lines)
+
+# Global daily reports manager
+_daily_reports_manager = None
 
-# Module interface
 def get_daily_reports_manager():
-    """Get the daily reports manager instance"""
-    return DailyReportsManager()
+    """Get the global daily reports manager instance"""
+    global _daily_reports_manager
+    if _daily_reports_manager is None:
+        _daily_reports_manager = DailyReportsManager()
+    return _daily_reports_manager
@@ -9,6 +9,48 @@ import sys
 import subprocess
 import platform
 
+# Demo catalogue seeded by create_sample_data (Product field values)
+SAMPLE_PRODUCTS = (
+    dict(name="Coca Cola 330ml", barcode="123456789001", category="Cooldrinks",
+         cost_price=8.50, sell_price=12.00, current_stock=50, min_stock=10),
+    dict(name="White Bread 700g", barcode="123456789002", category="Food",
+         cost_price=12.00, sell_price=16.00, current_stock=20, min_stock=5),
+    dict(name="2 Minute Noodles", barcode="123456789003", category="Food",
+         cost_price=3.50, sell_price=5.00, current_stock=100, min_stock=20),
+)
+
+COMPLETION_TEXT = """
+SETUP COMPLETE!
+============================================================
+
+NEXT STEPS:
+
+1. Start the application:
+   python app.py
+
+2. Login with demo credentials:
+   Admin: admin / admin123
+   POS:   demo / demo123
+
+3. Configure your shop:
+   - Go to Settings → Business
+   - Update shop name and details
+   - Add your products
+
+4. Training resources:
+   - Read INSTALLATION_GUIDE.md
+   - Try CLI demo: python demo_cli.py
+   - Run tests: python test_core_functionality.py
+
+NEED HELP?
+   - Check error messages
+   - Refer to INSTALLATION_GUIDE.md
+   - Restart the application
+
+DAILY BACKUP REMINDER:
+   Copy 'spaza_shop.db' file to USB/cloud storage
+"""
+
 def print_header():
     print("=" * 60)
     print("TEMBIE'S SPAZA SHOP POS SYSTEM - QUICK SETUP")
@@ -67,8 +109,8 @@ def test_system():
         print("Authentication system - OK")
         
         # Test transaction engine
-        from core.sales.transaction import SalesManager
-        sales = SalesManager()
+        from core.sales.transaction import TransactionManager
+        sales = TransactionManager()
         print("Sales transaction engine - OK")
         
         # Test product management
@@ -87,49 +129,22 @@ def create_sample_data():
     """Create sample products and users for testing"""
     print("\nSetting up sample data...")
     try:
-        from core.products.management import ProductManager
-        from core.auth.authentication import get_auth_manager
+        from core.database.connection import get_db_manager
+        from core.products.management import ProductManager, Product
         
         # Create sample products
         product_manager = ProductManager()
+        products = [Product(**fields) for fields in SAMPLE_PRODUCTS]
         
-        sample_products = [
-            {
-                "name": "Coca Cola 330ml",
-                "barcode": "123456789001",
-                "category": "Cooldrinks",
-                "cost_price": 8.50,
-                "sell_price": 12.00,
-                "current_stock": 50,
-                "min_stock": 10
-            },
-            {
-                "name": "White Bread 700g",
-                "barcode": "123456789002", 
-                "category": "Food",
-                "cost_price": 12.00,
-                "sell_price": 16.00,
-                "current_stock": 20,
-                "min_stock": 5
-            },
-            {
-                "name": "2 Minute Noodles",
-                "barcode": "123456789003",
-                "category": "Food", 
-                "cost_price": 3.50,
-                "sell_price": 5.00,
-                "current_stock": 100,
-                "min_stock": 20
-            }
-        ]
+        db = get_db_manager()
+        admin_result = db.execute_query("SELECT id FROM users WHERE role = 'admin' ORDER BY id LIMIT 1")
+        admin_id = admin_result[0]['id'] if admin_result else 1
         
-        for product in sample_products:
-            try:
-                product_manager.add_product(**product)
-                print(f"   Added: {product['name']}")
-            except:
-                # Product might already exist
-                pass
+        # Insert all products in one transaction; barcodes already present are skipped
+        product_ids = product_manager.create_products_bulk(products, admin_id, skip_existing=True)
+        for product, product_id in zip(products, product_ids):
+            if product_id is not None:
+                print(f"   Added: {product.name}")
                 
         print("Sample products added")
         return True
@@ -140,35 +155,7 @@ def create_sample_data():
 
 def show_completion_info():
     """Show completion information and next steps"""
-    print("\nSETUP COMPLETE!")
-    print("=" * 60)
-    print("\nNEXT STEPS:")
-    print()
-    print("1. Start the application:")
-    print("   python app.py")
-    print()
-    print("2. Login with demo credentials:")
-    print("   Admin: admin / admin123")
-    print("   POS:   demo / demo123")
-    print()
-    print("3. Configure your shop:")
-    print("   - Go to Settings → Business")
-    print("   - Update shop name and details")
-    print("   - Add your products")
-    print()
-    print("4. Training resources:")
-    print("   - Read INSTALLATION_GUIDE.md")
-    print("   - Try CLI demo: python demo_cli.py")
-    print("   - Run tests: python test_core_functionality.py")
-    print()
-    print("NEED HELP?")
-    print("   - Check error messages")
-    print("   - Refer to INSTALLATION_GUIDE.md")
-    print("   - Restart the application")
-    print()
-    print("DAILY BACKUP REMINDER:")
-    print("   Copy 'spaza_shop.db' file to USB/cloud storage")
-    print()
+    sys.stdout.write(COMPLETION_TEXT + "\n")
 
 def main():
     """Main setup process"""
@@ -4,20 +4,26 @@ This creates a complete installer package with Python included
 """
 
 import sys
+import compileall
+import py_compile
 from cx_Freeze import setup, Executable
 import os
 
+# Pure-Python packages are compiled and stored in library.zip, so imports
+# read bytecode from one open archive instead of stat'ing loose files
+ZIPPED_PACKAGES = ["modules", "config", "utils"]
+
 # Dependencies that need to be included
 build_exe_options = {
     "packages": [
         "tkinter", "sqlite3", "datetime", "hashlib", "uuid", 
-        "threading", "csv", "tempfile", "pathlib"
+        "threading", "csv", "tempfile", "pathlib",
+        *ZIPPED_PACKAGES,
     ],
+    "zip_include_packages": ZIPPED_PACKAGES,
     "include_files": [
+        # core stays on disk: connection.py reads base_schema.sql next to itself
         ("core/", "core/"),
-        ("modules/", "modules/"),
-        ("config/", "config/"),
-        ("utils/", "utils/"),
         ("requirements.txt", "requirements.txt"),
         ("README.md", "README.md"),
         ("spaza_shop.db", "spaza_shop.db"),
@@ -27,6 +33,14 @@ build_exe_options = {
     "include_msvcrt": True,
 }
 
+# Ship core with bytecode already built; hash-checked .pyc files stay valid
+# after the copy and never need rewriting in the install directory
+for level in (0, build_exe_options["optimize"]):
+    compileall.compile_dir(
+        "core", quiet=1, optimize=level,
+        invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+    )
+
 # Base for Windows GUI application (no console window)
 base = None
 if sys.platform == "win32":
@@ -3,12 +3,6 @@ Test Authentication Integration
 Verify authentication works with GUI components
 """
 
-import sys
-import os
-
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 def test_auth_integration():
     """Test authentication integration"""
     print(" Testing Authentication Integration")
@@ -71,24 +65,26 @@ def test_auth_integration():
             ("stockmgr", "manager123", "Stock Manager", "stock_manager")
         ]
         
-        for username, password, full_name, role in test_users:
-            try:
-                user_id = auth_manager.create_user(username, password, full_name, role, 1)
+        # Create all test users in one transaction
+        try:
+            user_ids = auth_manager.create_users_bulk(test_users)
+        except ValueError as e:
+            print(f" Error creating test users: {e}")
+            user_ids = []
+        
+        for (username, password, full_name, role), user_id in zip(test_users, user_ids):
+            if user_id is None:
+                print(f"️ User {username} already exists")
+            else:
                 print(f" Created {role}: {username}")
-                
-                # Test login
-                if auth_manager.login(username, password):
-                    user = auth_manager.get_current_user()
-                    can_sales = auth_manager.can_access_function('sales')
-                    can_reports = auth_manager.can_access_function('reports')
-                    print(f"  - {user.full_name}: Sales={can_sales}, Reports={can_reports}")
-                    auth_manager.logout()
-                
-            except ValueError as e:
-                if "already exists" in str(e):
-                    print(f"️ User {username} already exists")
-                else:
-                    print(f" Error creating {username}: {e}")
+            
+            # Test login
+            if auth_manager.login(username, password):
+                user = auth_manager.get_current_user()
+                can_sales = auth_manager.can_access_function('sales')
+                can_reports = auth_manager.can_access_function('reports')
+                print(f"  - {user.full_name}: Sales={can_sales}, Reports={can_reports}")
+                auth_manager.logout()
         
         print("\n Authentication integration test completed!")
         return True
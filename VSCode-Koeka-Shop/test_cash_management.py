@@ -4,12 +4,9 @@ Verify cash flow tracking and till reconciliation functionality
 """
 
 import sys
-import os
+import io
 from datetime import date
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 def test_cash_management():
     """Test daily cash management functionality"""
     print(" Testing Daily Cash Management")
@@ -50,14 +47,19 @@ def test_cash_management():
         # Test 2: Make some sales to generate cash flow
         print("\n2️⃣ Creating test sales...")
         
-        # Create a few sales
+        # Create a few sales and save them in one transaction
         products = product_manager.search_products("")
         if products:
+            sales = []
             for i in range(3):
                 sale = transaction_manager.start_new_sale(1)
                 transaction_manager.add_item_to_sale(products[0].id, 1)
                 transaction_manager.set_payment_method("cash", sale.total_amount + 5.0)
-                sale_id = transaction_manager.complete_sale()
+                sales.append(sale)
+            transaction_manager.current_sale = None
+            
+            transaction_manager.complete_sales_bulk(sales)
+            for sale in sales:
                 print(f"   Created cash sale: R{sale.total_amount:.2f}")
         
         # Test 3: Update sales totals
@@ -113,10 +115,12 @@ def test_cash_management():
         history = cash_manager.get_cash_history(7)
         print(f" Retrieved {len(history)} days of cash history")
         
+        buf = io.StringIO()
         for day_record in history:
             status = " Reconciled" if day_record.reconciled else "⏳ Pending"
-            print(f"  {day_record.date}: Opening R{day_record.opening_amount:.2f}, "
-                  f"Sales R{day_record.cash_sales:.2f}, {status}")
+            buf.write(f"  {day_record.date}: Opening R{day_record.opening_amount:.2f}, "
+                      f"Sales R{day_record.cash_sales:.2f}, {status}\n")
+        sys.stdout.write(buf.getvalue())
         
         print("\n Cash management test completed successfully!")
         return True
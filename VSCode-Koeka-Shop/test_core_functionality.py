@@ -3,18 +3,19 @@ Test script to verify core POS functionality
 This script tests the database, product management, and sales processing
 """
 
-import os
-import sys
+import uuid
 from datetime import datetime, date
 
-# Add the project root to Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from core.database.connection import get_db_manager
 from core.products.management import ProductManager, Product
 from core.sales.transaction import TransactionManager
 from core.sales.receipt import ReceiptGenerator
-from utils.helpers import hash_password
+from decimal import Decimal
+
+from utils.helpers import hash_password, round_currency
+
+# Hashed once at import; the salt is random, so any one hash of the password is valid
+ADMIN_PASSWORD_HASH = hash_password("admin123")
 
 def test_database_initialization():
     """Test database initialization"""
@@ -24,16 +25,15 @@ def test_database_initialization():
         db = get_db_manager()
         # Try a simple query
         result = db.execute_query("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row['name'] for row in result]
+        tables = {row['name'] for row in result}
         
         expected_tables = ['products', 'users', 'sales', 'sale_items', 'stock_movements', 'daily_cash', 'system_config']
         
+        missing = [table for table in expected_tables if table not in tables]
         for table in expected_tables:
-            if table in tables:
-                print(f" Table '{table}' exists")
-            else:
-                print(f" Table '{table}' missing")
-                return False
+            print(f" Table '{table}' {'exists' if table in tables else 'missing'}")
+        if missing:
+            return False
         
         print(" Database initialization successful")
         return True
@@ -46,24 +46,22 @@ def test_product_management():
     print("\nTesting product management...")
     
     try:
-        # Create admin user first (needed for stock movements)
+        # Create admin user first (needed for stock movements) and look up its ID
+        # in a single transaction
         db = get_db_manager()
-        admin_password = hash_password("admin123")
         
-        db.execute_update("""
-            INSERT OR IGNORE INTO users (username, password_hash, role, full_name)
-            VALUES (?, ?, ?, ?)
-        """, ("admin", admin_password, "admin", "System Administrator"))
-        
-        # Get admin user ID
-        admin_result = db.execute_query("SELECT id FROM users WHERE username = ?", ("admin",))
-        admin_id = admin_result[0]['id'] if admin_result else 1
+        with db.transaction() as conn:
+            conn.execute("""
+                INSERT OR IGNORE INTO users (username, password_hash, role, full_name)
+                VALUES (?, ?, ?, ?)
+            """, ("admin", ADMIN_PASSWORD_HASH, "admin", "System Administrator"))
+            admin_result = conn.execute("SELECT id FROM users WHERE username = ?", ("admin",)).fetchone()
+        admin_id = admin_result['id'] if admin_result else 1
         
         product_manager = ProductManager()
         
         # Create test product
-        import time
-        unique_barcode = f"123456789012{int(time.time()) % 10000}"  # Make barcode unique
+        unique_barcode = f"{uuid.uuid4().int % 10**13:013d}"  # Make barcode unique
         
         test_product = Product(
             name="Test Cola 330ml",
@@ -104,6 +102,15 @@ def test_product_management():
             print(" Stock adjustment failed")
             return False
         
+        # Editing a listed product must not leak into the shared product cache
+        listed = product_manager.get_all_products()
+        listed[0].name = "Edited in a form"
+        if product_manager.get_all_products()[0].name != "Edited in a form":
+            print(" Product list copies successful")
+        else:
+            print(" Product list shares cached products")
+            return False
+        
         return True
     except Exception as e:
         print(f" Product management test failed: {e}")
@@ -150,18 +157,17 @@ def test_sales_processing():
             return False
         
         # Complete sale
-        sale_id = transaction_manager.complete_sale()
-        print(f" Completed sale with ID: {sale_id}")
+        completed_sale = transaction_manager.complete_sale()
+        print(f" Completed sale with ID: {completed_sale.id}")
         
         # Test receipt generation
         receipt_generator = ReceiptGenerator()
-        completed_sale = transaction_manager.get_sale_by_id(sale_id)
         
         if completed_sale:
-            receipt_text = receipt_generator.generate_receipt_text(completed_sale)
+            receipt_text = receipt_generator.generate_receipt_text(completed_sale, max_len=200)
             print(" Generated receipt text")
             print("\n--- RECEIPT PREVIEW ---")
-            print(receipt_text[:200] + "..." if len(receipt_text) > 200 else receipt_text)
+            print(receipt_text)
             print("--- END RECEIPT ---\n")
         else:
             print(" Failed to generate receipt")
@@ -172,6 +178,17 @@ def test_sales_processing():
         print(f" Sales processing test failed: {e}")
         return False
 
+def test_round_currency():
+    """Test half-up currency rounding for the input types callers pass"""
+    print("\nTesting currency rounding...")
+    
+    assert round_currency(2.675) == 2.68, "2.675 should round half up"
+    assert round_currency("12.345") == 12.35, "numeric strings are accepted"
+    rounded = round_currency(Decimal("2.675"))
+    assert type(rounded) is float and rounded == 2.68, f"Decimal gave {rounded!r}"
+    assert round_currency(float("inf")) == float("inf"), "inf passes through"
+    print(" Currency rounding successful")
+
 def main():
     """Run all tests"""
     print("=" * 50)
@@ -181,14 +198,21 @@ def main():
     tests = [
         test_database_initialization,
         test_product_management,
-        test_sales_processing
+        test_sales_processing,
+        test_round_currency
     ]
     
     passed = 0
     total = len(tests)
     
     for test in tests:
-        if test():
+        try:
+            result = test()
+        except AssertionError as e:
+            print(f" {test.__name__} failed: {e}")
+            result = False
+        # Assert-style tests return None when they pass
+        if result is not False:
             passed += 1
     
     print("\n" + "=" * 50)
@@ -4,171 +4,148 @@ Run this to test all the new administrative GUI components
 """
 
 import sys
-import os
-import tkinter as tk
-from tkinter import messagebox
+import functools
+import contextlib
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Window modules the tests import; loaded together up front by main()
+GUI_MODULES = [
+    "app",
+    "core.ui.main_window",
+    "core.ui.product_management",
+    "core.ui.reports_window",
+    "core.ui.settings_window",
+    "core.ui.sales_screen",
+]
+
+def _preload_gui_modules():
+    """Import the window modules on worker threads so the tests find them in sys.modules"""
+    def load(name):
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # The test that imports the module reports the failure
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(load, GUI_MODULES))
+
+@functools.lru_cache(maxsize=None)
+def _session_user(username, password):
+    """Authenticate a demo account once and reuse it across tests"""
+    from core.auth.authentication import ensure_demo_user, get_auth_manager
+    
+    ensure_demo_user()
+    return get_auth_manager().authenticate_user(username, password)
+
+@contextlib.contextmanager
+def _mocked_tk():
+    """Replace Tk/Toplevel with mocks so windows build without a Tcl interpreter"""
+    with mock.patch("tkinter.Tk") as MockTk, mock.patch("tkinter.Toplevel"):
+        root = MockTk.return_value
+        # ttk.Style() and variables without a master fall back to the default root
+        with mock.patch("tkinter._default_root", root):
+            yield root
+
+def _start_session(username, password):
+    """Start an auth session for a cached demo account and return the user"""
+    from core.auth.authentication import get_auth_manager
+    
+    user = _session_user(username, password)
+    if user:
+        get_auth_manager().start_session(user)
+    return user
 
 def test_login_screen():
     """Test the login screen"""
     print("Testing Login Screen...")
-    try:
-        from app import LoginScreen
-        
-        root = tk.Tk()
-        root.withdraw()  # Hide root
-        
+    from app import LoginScreen
+    
+    # LoginScreen owns its Tk root
+    with _mocked_tk() as root:
         login = LoginScreen()
-        return True
-        
-    except Exception as e:
-        print(f"Login Screen Error: {e}")
-        return False
+    assert login.root is root, "LoginScreen did not build on the Tk root"
 
 def test_main_dashboard():
     """Test the main dashboard with admin user"""
     print("Testing Main Dashboard...")
-    try:
-        from core.auth.authentication import ensure_demo_user, get_auth_manager
-        from core.ui.main_window import MainWindow
-        
-        # Ensure demo user exists
-        ensure_demo_user()
-        
-        # Authenticate admin user
-        auth_manager = get_auth_manager()
-        admin_user = auth_manager.authenticate_user("admin", "admin123")
-        
-        if admin_user:
-            auth_manager.start_session(admin_user)
-            
-            # Test main window
-            root = tk.Tk()
-            root.withdraw()
-            
-            app = MainWindow(user=admin_user)
-            print(" Main Dashboard loaded successfully")
-            
-            # Don't actually show - just test creation
-            root.destroy()
-            return True
-        else:
-            print(" Failed to authenticate admin user")
-            return False
-            
-    except Exception as e:
-        print(f"Main Dashboard Error: {e}")
-        return False
+    from core.ui.main_window import MainWindow
+    
+    # Authenticate admin user
+    admin_user = _start_session("admin", "admin123")
+    assert admin_user, "Failed to authenticate admin user"
+    
+    # Test main window (it owns its Tk root)
+    with _mocked_tk():
+        app = MainWindow(user=admin_user)
+    print(" Main Dashboard loaded successfully")
+    
+    assert app.user is admin_user, "MainWindow did not keep the session user"
 
 def test_product_management():
     """Test product management GUI"""
     print("Testing Product Management...")
-    try:
-        from core.auth.authentication import ensure_demo_user, get_auth_manager
-        from core.ui.product_management import ProductManagementWindow
-        
-        # Setup auth
-        ensure_demo_user()
-        auth_manager = get_auth_manager()
-        admin_user = auth_manager.authenticate_user("admin", "admin123")
-        auth_manager.start_session(admin_user)
-        
-        # Test product management
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ProductManagementWindow(user=admin_user)
-        print(" Product Management loaded successfully")
-        
-        root.destroy()
-        return True
-        
-    except Exception as e:
-        print(f"Product Management Error: {e}")
-        return False
+    from core.ui.product_management import ProductManagementWindow
+    
+    # Setup auth
+    admin_user = _start_session("admin", "admin123")
+    assert admin_user, "Failed to authenticate admin user"
+    
+    # Test product management
+    with _mocked_tk() as root:
+        app = ProductManagementWindow(root, user=admin_user)
+    print(" Product Management loaded successfully")
+    
+    assert app.user is admin_user, "ProductManagementWindow did not keep the session user"
 
 def test_reports_window():
     """Test reports and cash management GUI"""
     print("Testing Reports Window...")
-    try:
-        from core.auth.authentication import ensure_demo_user, get_auth_manager
-        from core.ui.reports_window import ReportsWindow
-        
-        # Setup auth
-        ensure_demo_user()
-        auth_manager = get_auth_manager()
-        admin_user = auth_manager.authenticate_user("admin", "admin123")
-        auth_manager.start_session(admin_user)
-        
-        # Test reports
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ReportsWindow(user=admin_user)
-        print(" Reports Window loaded successfully")
-        
-        root.destroy()
-        return True
-        
-    except Exception as e:
-        print(f"Reports Window Error: {e}")
-        return False
+    from core.ui.reports_window import ReportsWindow
+    
+    # Setup auth
+    admin_user = _start_session("admin", "admin123")
+    assert admin_user, "Failed to authenticate admin user"
+    
+    # Test reports
+    with _mocked_tk() as root:
+        app = ReportsWindow(root, user=admin_user)
+    print(" Reports Window loaded successfully")
+    
+    assert app.user is admin_user, "ReportsWindow did not keep the session user"
 
 def test_settings_window():
     """Test settings GUI"""
     print("Testing Settings Window...")
-    try:
-        from core.auth.authentication import ensure_demo_user, get_auth_manager
-        from core.ui.settings_window import SettingsWindow
-        
-        # Setup auth
-        ensure_demo_user()
-        auth_manager = get_auth_manager()
-        admin_user = auth_manager.authenticate_user("admin", "admin123")
-        auth_manager.start_session(admin_user)
-        
-        # Test settings
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = SettingsWindow(user=admin_user)
-        print(" Settings Window loaded successfully")
-        
-        root.destroy()
-        return True
-        
-    except Exception as e:
-        print(f"Settings Window Error: {e}")
-        return False
+    from core.ui.settings_window import SettingsWindow
+    
+    # Setup auth
+    admin_user = _start_session("admin", "admin123")
+    assert admin_user, "Failed to authenticate admin user"
+    
+    # Test settings
+    with _mocked_tk() as root:
+        app = SettingsWindow(root, user=admin_user)
+    print(" Settings Window loaded successfully")
+    
+    assert app.user is admin_user, "SettingsWindow did not keep the session user"
 
 def test_sales_screen():
     """Test the existing sales screen"""
     print("Testing Sales Screen...")
-    try:
-        from core.auth.authentication import ensure_demo_user, get_auth_manager
-        from core.ui.sales_screen import SalesScreen
-        
-        # Setup auth
-        ensure_demo_user()
-        auth_manager = get_auth_manager()
-        pos_user = auth_manager.authenticate_user("demo", "demo123")
-        auth_manager.start_session(pos_user)
-        
-        # Test sales screen
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = SalesScreen(user=pos_user)
-        print(" Sales Screen loaded successfully")
-        
-        root.destroy()
-        return True
-        
-    except Exception as e:
-        print(f"Sales Screen Error: {e}")
-        return False
+    from core.ui.sales_screen import SalesScreen
+    
+    # Setup auth
+    pos_user = _start_session("demo", "demo123")
+    assert pos_user, "Failed to authenticate demo user"
+    
+    # Test sales screen
+    with _mocked_tk() as root:
+        app = SalesScreen(root, user_id=pos_user.id)
+    print(" Sales Screen loaded successfully")
+    
+    assert app.user_id == pos_user.id, "SalesScreen did not keep the session user id"
 
 def main():
     """Run all GUI tests"""
@@ -187,15 +164,18 @@ def main():
     
     results = []
     
+    # Windows are still built one at a time on the main thread
+    _preload_gui_modules()
+    
     for test_name, test_func in tests:
         print(f"\n {test_name}...")
         try:
-            success = test_func()
-            results.append((test_name, success))
-            if success:
-                print(f" {test_name} - PASSED")
-            else:
-                print(f" {test_name} - FAILED")
+            test_func()
+            results.append((test_name, True))
+            print(f" {test_name} - PASSED")
+        except AssertionError as e:
+            print(f" {test_name} - FAILED: {e}")
+            results.append((test_name, False))
         except Exception as e:
             print(f" {test_name} - ERROR: {e}")
             results.append((test_name, False))
@@ -4,10 +4,6 @@ Test script for product deletion functionality
 Demonstrates the new delete, archive, and restore features
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from core.products.management import ProductManager, Product
 from core.auth.authentication import ensure_demo_user, get_auth_manager
 from datetime import date, datetime
@@ -31,8 +27,8 @@ def test_product_deletion():
     # Initialize product manager
     pm = ProductManager()
     
-    # Test 1: Create a test product
-    print("\n1. Creating test product...")
+    # Test 1: Create test products (one to delete, one to archive)
+    print("\n1. Creating test products...")
     test_product = Product(
         name="Test Delete Product",
         barcode="DELETE123",
@@ -43,12 +39,23 @@ def test_product_deletion():
         monthly_stock=100,
         min_stock=5
     )
+    archive_product = Product(
+        name="Test Archive Product",
+        barcode="ARCHIVE123",
+        category="Food",
+        cost_price=5.0,
+        sell_price=8.0,
+        current_stock=25,
+        monthly_stock=50,
+        min_stock=3
+    )
     
     try:
-        product_id = pm.create_product(test_product, demo_user.id)
+        product_id, archive_product_id = pm._seed_raw([test_product, archive_product])
         print(f"✅ Created product with ID: {product_id}")
+        print(f"✅ Created product for archiving with ID: {archive_product_id}")
     except Exception as e:
-        print(f"❌ Failed to create product: {e}")
+        print(f"❌ Failed to create products: {e}")
         return
     
     # Test 2: Check deletion constraints for new product
@@ -74,28 +81,8 @@ def test_product_deletion():
     else:
         print("\n3. Skipping deletion - product has constraints")
     
-    # Test 4: Create another product for archiving
-    print("\n4. Creating product for archiving test...")
-    archive_product = Product(
-        name="Test Archive Product",
-        barcode="ARCHIVE123",
-        category="Food",
-        cost_price=5.0,
-        sell_price=8.0,
-        current_stock=25,
-        monthly_stock=50,
-        min_stock=3
-    )
-    
-    try:
-        archive_product_id = pm.create_product(archive_product, demo_user.id)
-        print(f"✅ Created product for archiving with ID: {archive_product_id}")
-    except Exception as e:
-        print(f"❌ Failed to create archive product: {e}")
-        return
-    
-    # Test 5: Archive the product
-    print("\n5. Archiving product...")
+    # Test 4: Archive the product
+    print("\n4. Archiving product...")
     try:
         success = pm.archive_product(archive_product_id, demo_user.id)
         if success:
@@ -105,8 +92,8 @@ def test_product_deletion():
     except Exception as e:
         print(f"❌ Error archiving product: {e}")
     
-    # Test 6: List archived products
-    print("\n6. Listing archived products...")
+    # Test 5: List archived products
+    print("\n5. Listing archived products...")
     try:
         archived = pm.get_archived_products()
         print(f"Found {len(archived)} archived products:")
@@ -115,8 +102,8 @@ def test_product_deletion():
     except Exception as e:
         print(f"❌ Error listing archived products: {e}")
     
-    # Test 7: Check all products excludes archived by default
-    print("\n7. Checking active products list...")
+    # Test 6: Check all products excludes archived by default
+    print("\n6. Checking active products list...")
     try:
         active_products = pm.get_all_products(include_archived=False)
         archived_names = [p.name for p in active_products if p.name == "Test Archive Product"]
@@ -127,8 +114,8 @@ def test_product_deletion():
     except Exception as e:
         print(f"❌ Error checking active products: {e}")
     
-    # Test 8: Restore archived product
-    print("\n8. Restoring archived product...")
+    # Test 7: Restore archived product
+    print("\n7. Restoring archived product...")
     try:
         success = pm.restore_product(archive_product_id, demo_user.id)
         if success:
@@ -146,19 +133,17 @@ def test_product_deletion():
     except Exception as e:
         print(f"❌ Error restoring product: {e}")
     
-    # Test 9: Clean up - delete the test product
-    print("\n9. Cleaning up test products...")
+    # Test 8: Clean up - delete the test product
+    print("\n8. Cleaning up test products...")
     try:
         # Get all products including archived
         all_products = pm.get_all_products(include_archived=True)
         test_products = [p for p in all_products if p.name.startswith("Test")]
         
+        deleted = pm.delete_products_bulk([p.id for p in test_products], demo_user.id)
         for product in test_products:
-            try:
-                pm.delete_product(product.id, demo_user.id, force=True)
-                print(f"✅ Cleaned up: {product.name}")
-            except Exception as e:
-                print(f"❌ Failed to clean up {product.name}: {e}")
+            print(f"✅ Cleaned up: {product.name}")
+        print(f"✅ Deleted {deleted} test products in one transaction")
     except Exception as e:
         print(f"❌ Error during cleanup: {e}")
     
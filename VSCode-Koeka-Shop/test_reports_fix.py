@@ -0,0 +1,29 @@
+"""
+Test script for the reports window fixes
+Verifies ReportsWindow still exposes the report and status bar methods
+"""
+
+REQUIRED_METHODS = {
+    "generate_daily_report",
+    "generate_monthly_report",
+    "create_status_bar",
+    "update_status",
+}
+
+def test_reports_window_methods():
+    """Test that ReportsWindow defines every required method"""
+    print("Testing ReportsWindow methods...")
+    from core.ui.reports_window import ReportsWindow
+    
+    # One dir() and a set difference instead of a hasattr() per method
+    available = set(dir(ReportsWindow))
+    missing = REQUIRED_METHODS - available
+    
+    for method in sorted(REQUIRED_METHODS):
+        status = "✅" if method in available else "❌"
+        print(f"{status} ReportsWindow.{method}")
+    
+    assert not missing, f"ReportsWindow is missing {sorted(missing)}"
+
+if __name__ == "__main__":
+    test_reports_window_methods()
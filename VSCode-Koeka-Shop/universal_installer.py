@@ -9,8 +9,10 @@ import sys
 import subprocess
 import platform
 import shutil
+import re
 import json
-import sqlite3
+import hashlib
+from importlib import metadata
 from pathlib import Path
 
 class Colors:
@@ -23,11 +25,35 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Status line templates with the colour codes filled in once
+STEP_FORMAT = f"\n{Colors.OKCYAN}[{{}}] {{}}...{Colors.ENDC}"
+SUCCESS_FORMAT = f"{Colors.OKGREEN}✓ {{}}{Colors.ENDC}"
+ERROR_FORMAT = f"{Colors.FAIL}✗ {{}}{Colors.ENDC}"
+WARNING_FORMAT = f"{Colors.WARNING}⚠ {{}}{Colors.ENDC}"
+
+# Distribution name at the start of a requirements.txt line
+REQUIREMENT_NAME = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]*')
+
 class PosInstaller:
+    # Slow steps skipped on a re-run when their inputs are unchanged and their
+    # outputs still exist. The database and demo data steps always run: they
+    # are quick, and the database file may have been deleted since.
+    CACHEABLE_STEPS = ("install_dependencies",)
+    
     def __init__(self):
         self.system = platform.system()
         self.install_dir = Path(__file__).parent
         self.python_executable = sys.executable
+        self.state_file = self.install_dir / ".install_state.json"
+        
+        # Platform-specific steps, resolved once for the detected system
+        self._create_launchers = (self._create_windows_launchers if self.system == "Windows"
+                                  else self._create_unix_launchers)
+        self._create_platform_shortcuts = {
+            "Windows": self._create_windows_shortcuts,
+            "Linux": self._create_linux_shortcuts,
+            "Darwin": self._create_macos_shortcuts,  # macOS
+        }.get(self.system, self._shortcuts_not_supported)
         
     def print_header(self):
         print(f"\n{Colors.HEADER}{Colors.BOLD}")
@@ -39,23 +65,23 @@ class PosInstaller:
         print(f"{Colors.OKBLUE}Detected system: {self.system}{Colors.ENDC}\n")
         
     def print_step(self, step, description):
-        print(f"\n{Colors.OKCYAN}[{step}] {description}...{Colors.ENDC}")
+        print(STEP_FORMAT.format(step, description))
         
     def print_success(self, message):
-        print(f"{Colors.OKGREEN}✓ {message}{Colors.ENDC}")
+        print(SUCCESS_FORMAT.format(message))
         
     def print_error(self, message):
-        print(f"{Colors.FAIL}✗ {message}{Colors.ENDC}")
+        print(ERROR_FORMAT.format(message))
         
     def print_warning(self, message):
-        print(f"{Colors.WARNING}⚠ {message}{Colors.ENDC}")
+        print(WARNING_FORMAT.format(message))
         
-    def run_command(self, command, check=True):
-        """Run a command and return success status"""
+    def run_command(self, argv, check=True):
+        """Run a command (argument list, no shell) and return success status"""
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
+            result = subprocess.run(argv, capture_output=True, text=True)
             if check and result.returncode != 0:
-                raise subprocess.CalledProcessError(result.returncode, command, result.stderr)
+                raise subprocess.CalledProcessError(result.returncode, argv, result.stderr)
             return result.returncode == 0, result.stdout, result.stderr
         except Exception as e:
             return False, "", str(e)
@@ -71,8 +97,13 @@ class PosInstaller:
             
         self.print_success(f"Python {sys.version.split()[0]} found")
         
-        # Check pip
-        success, _, _ = self.run_command(f'"{self.python_executable}" -m pip --version')
+        # Check pip (only the exit status matters, so output is discarded)
+        try:
+            result = subprocess.run([self.python_executable, '-m', 'pip', '--version'],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            success = result.returncode == 0
+        except OSError:
+            success = False
         if success:
             self.print_success("pip is available")
             return True
@@ -99,7 +130,7 @@ class PosInstaller:
             
         # Install from requirements.txt
         success, stdout, stderr = self.run_command(
-            f'"{self.python_executable}" -m pip install -r "{requirements_file}"'
+            [self.python_executable, '-m', 'pip', 'install', '-r', str(requirements_file)]
         )
         
         if success:
@@ -145,11 +176,7 @@ class PosInstaller:
     def create_launcher_scripts(self):
         """Create platform-specific launcher scripts"""
         self.print_step("5/8", "Creating launcher scripts")
-        
-        if self.system == "Windows":
-            return self._create_windows_launchers()
-        else:
-            return self._create_unix_launchers()
+        return self._create_launchers()
             
     def _create_windows_launchers(self):
         """Create Windows batch files"""
@@ -217,16 +244,12 @@ Categories=Office;Finance;
     def create_shortcuts(self):
         """Create desktop and menu shortcuts"""
         self.print_step("6/8", "Creating shortcuts")
+        return self._create_platform_shortcuts()
         
-        if self.system == "Windows":
-            return self._create_windows_shortcuts()
-        elif self.system == "Linux":
-            return self._create_linux_shortcuts()
-        elif self.system == "Darwin":  # macOS
-            return self._create_macos_shortcuts()
-        else:
-            self.print_warning("Shortcut creation not supported on this platform")
-            return True
+    def _shortcuts_not_supported(self):
+        """Fallback for platforms without shortcut support"""
+        self.print_warning("Shortcut creation not supported on this platform")
+        return True
             
     def _create_windows_shortcuts(self):
         """Create Windows shortcuts"""
@@ -398,10 +421,59 @@ cd "{self.install_dir}"
         
         print(f"{Colors.OKBLUE}For support and documentation, see README.md{Colors.ENDC}")
         
+    def _state_hash(self):
+        """Hash the inputs of the cacheable steps: requirements and Python build"""
+        digest = hashlib.blake2b(digest_size=16)
+        requirements_file = self.install_dir / "requirements.txt"
+        if requirements_file.exists():
+            digest.update(requirements_file.read_bytes())
+        digest.update(f"{self.python_executable}\n{sys.version}\n".encode())
+        return digest.hexdigest()
+        
+    def _dependencies_installed(self):
+        """Check that every package in requirements.txt is still installed"""
+        requirements_file = self.install_dir / "requirements.txt"
+        if not requirements_file.exists():
+            return True
+        for line in requirements_file.read_text().splitlines():
+            match = REQUIREMENT_NAME.match(line.split("#", 1)[0].strip())
+            if match:
+                try:
+                    metadata.version(match.group())
+                except metadata.PackageNotFoundError:
+                    return False
+        return True
+        
+    def _step_outputs_present(self, name):
+        """Check that a cached step's results are still in place"""
+        if name == "install_dependencies":
+            return self._dependencies_installed()
+        return False
+        
+    def _load_state(self):
+        """Load the record of the last installation run"""
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+            
+    def _save_state(self, state_hash, steps_done):
+        """Record which steps succeeded for the given inputs"""
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump({"last_hash": state_hash, "steps_done": steps_done}, f, indent=2)
+        except OSError as e:
+            self.print_warning(f"Could not save installation state: {e}")
+            
     def install(self):
         """Run the complete installation process"""
         self.print_header()
         
+        state_hash = self._state_hash()
+        state = self._load_state()
+        cached_steps = set(state.get("steps_done", [])) if state.get("last_hash") == state_hash else set()
+        
         steps = [
             self.check_python,
             self.install_dependencies,
@@ -414,12 +486,22 @@ cd "{self.install_dir}"
         ]
         
         success_count = 0
+        steps_done = []
         for step in steps:
-            if step():
+            name = step.__name__
+            if (name in self.CACHEABLE_STEPS and name in cached_steps
+                    and self._step_outputs_present(name)):
+                self.print_success(f"{name.replace('_', ' ').capitalize()} (unchanged since last run, skipped)")
+                success_count += 1
+                steps_done.append(name)
+            elif step():
                 success_count += 1
+                steps_done.append(name)
             else:
                 print(f"\n{Colors.FAIL}Installation step failed. Continuing...{Colors.ENDC}")
                 
+        self._save_state(state_hash, steps_done)
+        
         if success_count >= 6:  # At least core steps successful
             self.print_completion_message()
         else:
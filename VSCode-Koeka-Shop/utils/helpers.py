@@ -4,42 +4,66 @@ Provides helper functions used across the application
 """
 
 import os
+import re
+import math
 import json
+import time
+import functools
+import itertools
 import hashlib
+import hmac
 import secrets
 from datetime import datetime, date, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from typing import Dict, Any, Optional, List, Union
 
+try:
+    # Optional: much faster JSON for large backup files (pip install orjson)
+    import orjson
+except ImportError:
+    orjson = None
+
+# PBKDF2 rounds for new password hashes; stored in each hash so it can be raised later
+PASSWORD_HASH_ITERATIONS = 100_000
+
 def hash_password(password: str) -> str:
-    """Hash password using SHA-256 with salt"""
+    """Hash password using PBKDF2-HMAC-SHA256 with a random salt"""
     # Generate a random salt
-    salt = secrets.token_hex(16)
+    salt = secrets.token_bytes(16)
     
     # Hash password with salt
-    password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
+    password_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt,
+                                        PASSWORD_HASH_ITERATIONS, dklen=32)
     
-    # Return salt:hash format
-    return f"{salt}:{password_hash}"
+    # Return pbkdf2_sha256$iterations$salt$hash format
+    return f"pbkdf2_sha256${PASSWORD_HASH_ITERATIONS}${salt.hex()}${password_hash.hex()}"
 
 def verify_password(password: str, stored_hash: str) -> bool:
     """Verify password against stored hash"""
     try:
-        salt, password_hash = stored_hash.split(':')
-        
-        # Hash the provided password with the stored salt
-        test_hash = hashlib.sha256((password + salt).encode()).hexdigest()
+        if stored_hash.startswith('pbkdf2_sha256$'):
+            _, iterations, salt, password_hash = stored_hash.split('$')
+            test_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'),
+                                            bytes.fromhex(salt), int(iterations)).hex()
+        else:
+            # Older salt:hash format (single salted SHA-256)
+            salt, sep, password_hash = stored_hash.partition(':')
+            if not sep:
+                return False
+            test_hash = hashlib.sha256((password + salt).encode()).hexdigest()
         
-        # Compare hashes
-        return test_hash == password_hash
-    except ValueError:
+        # Compare hashes in constant time; a stored hash with non-ASCII characters
+        # makes compare_digest raise TypeError, which is just a failed check
+        return hmac.compare_digest(test_hash, password_hash)
+    except (ValueError, TypeError):
         return False
 
 def generate_transaction_ref() -> str:
     """Generate unique transaction reference"""
-    # Use timestamp + random hex for uniqueness
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    random_part = secrets.token_hex(4).upper()
-    return f"TXN-{timestamp[-8:]}{random_part[:4]}"
+    # Use timestamp (day of month + time) + random hex for uniqueness
+    timestamp = time.strftime('%d%H%M%S')
+    random_part = secrets.token_hex(2).upper()
+    return f"TXN-{timestamp}{random_part}"
 
 def calculate_vat_amount(total_amount: float, vat_rate: float, vat_inclusive: bool = True) -> float:
     """Calculate VAT amount from total"""
@@ -59,8 +83,8 @@ def calculate_subtotal(total_amount: float, vat_rate: float, vat_inclusive: bool
         return total_amount
     
     if vat_inclusive:
-        # Remove VAT from total
-        return total_amount - calculate_vat_amount(total_amount, vat_rate, vat_inclusive)
+        # Remove VAT from total: total - total * rate / (100 + rate)
+        return total_amount * 100 / (100 + vat_rate)
     else:
         # Subtotal is the same as total when VAT is not included
         return total_amount
@@ -77,31 +101,33 @@ def format_date(d: date, format_str: str = '%Y-%m-%d') -> str:
         return ""
     return d.strftime(format_str)
 
+# Results are immutable, so repeated strings (report filters, reloaded JSON) share one parse.
+# The wrappers below call it inside their try blocks, so unhashable input (a TypeError
+# from the cache) still gives None.
+@functools.lru_cache(maxsize=4096)
+def _strptime_cached(value: str, format_str: str) -> datetime:
+    return datetime.strptime(value, format_str)
+
 def parse_datetime(dt_str: str, format_str: str = '%Y-%m-%d %H:%M:%S') -> Optional[datetime]:
     """Parse string to datetime"""
     try:
-        return datetime.strptime(dt_str, format_str)
+        return _strptime_cached(dt_str, format_str)
     except (ValueError, TypeError):
         return None
 
 def parse_date(date_str: str, format_str: str = '%Y-%m-%d') -> Optional[date]:
     """Parse string to date"""
     try:
-        return datetime.strptime(date_str, format_str).date()
+        return _strptime_cached(date_str, format_str).date()
     except (ValueError, TypeError):
         return None
 
 def get_date_range(start_date: date, end_date: date) -> List[date]:
     """Get list of dates between start and end date (inclusive)"""
-    dates = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        dates.append(current_date)
-        current_date += timedelta(days=1)
-    
-    return dates
+    return [date.fromordinal(day)
+            for day in range(start_date.toordinal(), end_date.toordinal() + 1)]
 
+@functools.lru_cache(maxsize=256)
 def get_month_start_end(year: int, month: int) -> tuple[date, date]:
     """Get first and last day of a month"""
     start_date = date(year, month, 1)
@@ -113,9 +139,21 @@ def get_month_start_end(year: int, month: int) -> tuple[date, date]:
     
     return start_date, end_date
 
+CENTS = Decimal('0.01')
+
 def round_currency(amount: float, decimal_places: int = 2) -> float:
-    """Round amount to specified decimal places"""
-    return round(float(amount), decimal_places)
+    """Round amount to specified decimal places (half up, as on a till slip)"""
+    # str() gives the shortest decimal form, so 2.675 rounds to 2.68 rather than
+    # to 2.67 as its binary value would under round()
+    amount = float(amount)
+    if not math.isfinite(amount):
+        return amount  # inf/nan pass through, as round() leaves them
+    quantum = CENTS if decimal_places == 2 else Decimal(1).scaleb(-decimal_places)
+    try:
+        return float(Decimal(str(amount)).quantize(quantum, rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        # Too many digits for the decimal context (e.g. 1e30); round() copes
+        return round(amount, decimal_places)
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """Safely divide two numbers, return default if division by zero"""
@@ -131,19 +169,32 @@ def percentage_change(old_value: float, new_value: float) -> float:
     if old_value == 0:
         return 0.0 if new_value == 0 else 100.0
     
-    return ((new_value - old_value) / old_value) * 100
+    return (new_value - old_value) * 100.0 / old_value
+
+# Sequence number so backups made within the same second get distinct names
+BACKUP_SEQUENCE = itertools.count()
 
 def create_backup_filename(prefix: str = "spaza_backup") -> str:
     """Create backup filename with timestamp"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    return f"{prefix}_{timestamp}.json"
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    return f"{prefix}_{timestamp}_{next(BACKUP_SEQUENCE):04d}.json"
 
 def save_json_file(data: Dict[str, Any], filepath: str) -> bool:
     """Save data to JSON file"""
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # dirname is '' for a bare filename, which makedirs rejects
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
+        if orjson is not None:
+            # Hand dates and dataclasses to str(), as the json path does
+            options = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                       orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, default=str, option=options))
+            return True
+        
+        # json.dump writes chunk by chunk; a large buffer keeps that to few write calls
+        with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
             json.dump(data, f, indent=2, default=str, ensure_ascii=False)
         
         return True
@@ -153,6 +204,10 @@ def save_json_file(data: Dict[str, Any], filepath: str) -> bool:
 def load_json_file(filepath: str) -> Optional[Dict[str, Any]]:
     """Load data from JSON file"""
     try:
+        if orjson is not None:
+            with open(filepath, 'rb') as f:
+                return orjson.loads(f.read())
+        
         with open(filepath, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception:
@@ -173,19 +228,29 @@ def get_file_size(filepath: str) -> int:
     except (OSError, FileNotFoundError):
         return 0
 
+def get_file_sizes(directory: str) -> Dict[str, int]:
+    """Get sizes in bytes of the files in a directory, keyed by file name"""
+    try:
+        # scandir entries carry their stat data, so there is no per-file getsize call
+        with os.scandir(directory) as entries:
+            return {entry.name: entry.stat().st_size
+                    for entry in entries if entry.is_file()}
+    except (OSError, FileNotFoundError):
+        return {}
+
+FILE_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
+    # Each unit is 2**10 of the previous one, so the bit length picks the unit
     i = 0
+    if size_bytes >= 1024:
+        i = min((int(size_bytes).bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
     
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {FILE_SIZE_UNITS[i]}"
 
 def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     """Truncate text to max length with optional suffix"""
@@ -194,18 +259,17 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     
     return text[:max_length - len(suffix)] + suffix
 
+# Characters not allowed in Windows filenames, each mapped to '_'
+INVALID_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+UNDERSCORE_RUNS = re.compile(r'_{2,}')
+
 def clean_filename(filename: str) -> str:
     """Clean filename by removing invalid characters"""
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    cleaned = filename
-    
-    for char in invalid_chars:
-        cleaned = cleaned.replace(char, '_')
+    # Replace invalid characters in one pass
+    cleaned = filename.translate(INVALID_FILENAME_CHARS)
     
     # Remove multiple consecutive underscores
-    while '__' in cleaned:
-        cleaned = cleaned.replace('__', '_')
+    cleaned = UNDERSCORE_RUNS.sub('_', cleaned)
     
     # Strip leading/trailing underscores and spaces
     cleaned = cleaned.strip('_ ')
@@ -214,20 +278,22 @@ def clean_filename(filename: str) -> str:
 
 def get_business_days_between(start_date: date, end_date: date) -> int:
     """Get number of business days (Mon-Fri) between two dates"""
-    current_date = start_date
-    business_days = 0
+    total_days = (end_date - start_date).days + 1
+    if total_days <= 0:
+        return 0
     
-    while current_date <= end_date:
-        if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-            business_days += 1
-        current_date += timedelta(days=1)
+    # Every full week has 5 business days; only the leftover days need checking
+    full_weeks, extra_days = divmod(total_days, 7)
+    first_weekday = start_date.weekday()
+    leftover = sum(1 for i in range(extra_days) if (first_weekday + i) % 7 < 5)  # Monday = 0, Friday = 4
     
-    return business_days
+    return full_weeks * 5 + leftover
 
 def is_weekend(check_date: date) -> bool:
     """Check if date is weekend (Saturday or Sunday)"""
     return check_date.weekday() >= 5  # Saturday = 5, Sunday = 6
 
+@functools.lru_cache(maxsize=256)
 def get_quarter_dates(year: int, quarter: int) -> tuple[date, date]:
     """Get start and end dates for a quarter"""
     if quarter not in [1, 2, 3, 4]:
@@ -4,16 +4,38 @@ Provides validation functions for user input and business logic
 """
 
 import re
-from typing import Optional, Union
+import string
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime, date
 
+# Patterns and translate tables built once at import time
+NON_CURRENCY_CHARS = re.compile(r'[^\d.-]')
+CURRENCY_DECORATIONS = str.maketrans('', '', 'R $,')
+ISO_DATE_PATTERN = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+
+# ASCII only, so accented letters and other digit scripts don't count
+ASCII_LETTERS = frozenset(string.ascii_letters)
+ASCII_DIGITS = frozenset(string.digits)
+USERNAME_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+UPPER_HEX_DIGITS = frozenset('0123456789ABCDEF')
+CURRENCY_CHARS = frozenset('0123456789.-')
+
+VALID_CATEGORIES = frozenset({'Food', 'Household', 'Sweets', 'Cooldrinks', 'Other'})
+VALID_ROLES = frozenset({'admin', 'pos_operator', 'stock_manager'})
+VALID_PAYMENT_METHODS = frozenset({'cash', 'card', 'mixed'})
+
+# Bound str.format per currency so the pattern is parsed once; currencies
+# without their own symbol are added on first use as "<code> <amount>"
+CURRENCY_FORMATS = {'ZAR': 'R{:.2f}'.format}
+
 def validate_product_name(name: str) -> bool:
     """Validate product name"""
-    if not name or not name.strip():
+    if not name:
         return False
     
     # Must be between 1 and 100 characters
-    if len(name.strip()) > 100:
+    name = name.strip()
+    if not 1 <= len(name) <= 100:
         return False
     
     return True
@@ -23,14 +45,14 @@ def validate_barcode(barcode: Optional[str]) -> bool:
     if barcode is None or barcode == "":
         return True  # Barcode is optional
     
-    # Remove spaces and check if numeric
-    barcode_clean = barcode.replace(" ", "")
+    # Remove spaces (scanned barcodes usually have none) and check if numeric
+    barcode_clean = barcode.replace(" ", "") if " " in barcode else barcode
     
-    # Must be numeric and between 8-18 digits (common barcode lengths)
-    if not barcode_clean.isdigit():
+    # Must be between 8-18 digits (common barcode lengths)
+    if not 8 <= len(barcode_clean) <= 18:
         return False
     
-    if len(barcode_clean) < 8 or len(barcode_clean) > 18:
+    if not barcode_clean.isdigit():
         return False
     
     return True
@@ -40,20 +62,13 @@ def validate_price(price: Union[str, float, int]) -> bool:
     try:
         price_float = float(price)
         
-        # Must be positive
-        if price_float < 0:
-            return False
-        
-        # Must not exceed reasonable maximum (R100,000)
-        if price_float > 100000:
+        # Must be positive and not exceed reasonable maximum (R100,000)
+        if not 0 <= price_float <= 100000:
             return False
         
         # Check for reasonable decimal places (max 2)
-        price_str = str(price_float)
-        if '.' in price_str:
-            decimal_places = len(price_str.split('.')[1])
-            if decimal_places > 2:
-                return False
+        if abs(round(price_float, 2) - price_float) > 1e-9:
+            return False
         
         return True
     except (ValueError, TypeError):
@@ -61,53 +76,106 @@ def validate_price(price: Union[str, float, int]) -> bool:
 
 def validate_stock_quantity(quantity: Union[str, int]) -> bool:
     """Validate stock quantity"""
-    try:
-        quantity_int = int(quantity)
-        
-        # Must be non-negative
-        if quantity_int < 0:
-            return False
-        
-        # Must not exceed reasonable maximum (1,000,000)
-        if quantity_int > 1000000:
+    # Quantities from the database are already ints
+    if type(quantity) is int:
+        quantity_int = quantity
+    else:
+        try:
+            quantity_int = int(quantity)
+        except (ValueError, TypeError):
             return False
-        
-        return True
-    except (ValueError, TypeError):
-        return False
+    
+    # Must be non-negative and not exceed reasonable maximum (1,000,000)
+    return 0 <= quantity_int <= 1000000
 
 def validate_vat_rate(vat_rate: Union[str, float, int]) -> bool:
     """Validate VAT rate percentage"""
-    try:
-        vat_float = float(vat_rate)
-        
-        # Must be between 0 and 100
-        if vat_float < 0 or vat_float > 100:
+    if type(vat_rate) is float:
+        vat_float = vat_rate
+    else:
+        try:
+            vat_float = float(vat_rate)
+        except (ValueError, TypeError):
             return False
-        
-        return True
-    except (ValueError, TypeError):
-        return False
+    
+    # Must be between 0 and 100
+    return 0 <= vat_float <= 100
+
+def validate_prices(prices: Iterable[Union[str, float, int]]) -> List[bool]:
+    """Validate a column of prices, e.g. from a bulk product import"""
+    return list(map(validate_price, prices))
+
+def validate_stock_quantities(quantities: Iterable[Union[str, int]]) -> List[bool]:
+    """Validate a column of stock quantities"""
+    return list(map(validate_stock_quantity, quantities))
+
+def validate_vat_rates(vat_rates: Iterable[Union[str, float, int]]) -> List[bool]:
+    """Validate a column of VAT rates"""
+    return list(map(validate_vat_rate, vat_rates))
+
+def validate_products(rows: Iterable[Dict[str, Any]]) -> List[Tuple[bool, Optional[str]]]:
+    """Validate product rows from a bulk import
+    
+    Rows use the Product field names; only name and sell_price are required.
+    Each result is (True, None) or (False, reason) for the first failed check.
+    """
+    today = date.today()
+    categories = VALID_CATEGORIES
+    results = []
+    for row in rows:
+        get = row.get
+        if not validate_product_name(get('name')):
+            results.append((False, "Product name is required (max 100 characters)"))
+        elif not validate_barcode(get('barcode')):
+            results.append((False, "Barcode must be 8-18 digits"))
+        elif get('category', 'Other') not in categories:
+            results.append((False, "Unknown category"))
+        elif not validate_price(get('cost_price', 0)):
+            results.append((False, "Cost price must be between 0 and 100000"))
+        elif not validate_price(get('sell_price')):
+            results.append((False, "Sell price must be between 0 and 100000"))
+        elif not (validate_stock_quantity(get('current_stock', 0))
+                  and validate_stock_quantity(get('min_stock', 0))
+                  and validate_stock_quantity(get('monthly_stock', 0))):
+            results.append((False, "Stock quantities must be whole numbers from 0 to 1000000"))
+        elif not validate_vat_rate(get('vat_rate', 15.0)):
+            results.append((False, "VAT rate must be between 0 and 100"))
+        elif not validate_expiry_date(get('expiry_date'), today):
+            results.append((False, "Expiry date must be today or later (YYYY-MM-DD)"))
+        else:
+            results.append((True, None))
+    return results
 
 def validate_category(category: str) -> bool:
     """Validate product category"""
-    valid_categories = ['Food', 'Household', 'Sweets', 'Cooldrinks', 'Other']
-    return category in valid_categories
+    return category in VALID_CATEGORIES
 
-def validate_expiry_date(expiry_date: Optional[Union[str, date]]) -> bool:
-    """Validate expiry date"""
+def validate_expiry_date(expiry_date: Optional[Union[str, date]],
+                         today: Optional[date] = None) -> bool:
+    """Validate expiry date
+    
+    Pass ``today`` when checking many rows so date.today() is only
+    looked up once per batch.
+    """
     if expiry_date is None:
         return True  # Expiry date is optional
     
+    if today is None:
+        today = date.today()
+    
     if isinstance(expiry_date, date):
         # Must be in the future or today
-        return expiry_date >= date.today()
+        return expiry_date >= today
     
     if isinstance(expiry_date, str):
         try:
             # Try to parse date string (YYYY-MM-DD format)
-            parsed_date = datetime.strptime(expiry_date, '%Y-%m-%d').date()
-            return parsed_date >= date.today()
+            match = ISO_DATE_PATTERN.fullmatch(expiry_date)
+            if match:
+                parsed_date = date(*map(int, match.groups()))
+            else:
+                parsed_date = datetime.strptime(expiry_date, '%Y-%m-%d').date()
+            return parsed_date >= today
         except ValueError:
             return False
     
@@ -115,16 +183,16 @@ def validate_expiry_date(expiry_date: Optional[Union[str, date]]) -> bool:
 
 def validate_username(username: str) -> bool:
     """Validate username"""
-    if not username or not username.strip():
+    if not username:
         return False
     
     # Must be between 3 and 50 characters
     username = username.strip()
-    if len(username) < 3 or len(username) > 50:
+    if not 3 <= len(username) <= 50:
         return False
     
     # Must contain only alphanumeric characters and underscores
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+    if not USERNAME_CHARS.issuperset(username):
         return False
     
     return True
@@ -139,77 +207,76 @@ def validate_password(password: str) -> bool:
         return False
     
     # Must contain at least one letter and one number
-    has_letter = bool(re.search(r'[a-zA-Z]', password))
-    has_number = bool(re.search(r'[0-9]', password))
+    has_letter = not ASCII_LETTERS.isdisjoint(password)
+    has_number = not ASCII_DIGITS.isdisjoint(password)
     
     return has_letter and has_number
 
 def validate_user_role(role: str) -> bool:
     """Validate user role"""
-    valid_roles = ['admin', 'pos_operator', 'stock_manager']
-    return role in valid_roles
+    return role in VALID_ROLES
 
 def validate_payment_method(payment_method: str) -> bool:
     """Validate payment method"""
-    valid_methods = ['cash', 'card', 'mixed']
-    return payment_method in valid_methods
+    return payment_method in VALID_PAYMENT_METHODS
 
 def validate_cash_amount(amount: Union[str, float, int], total_due: float = 0) -> bool:
     """Validate cash payment amount"""
     try:
-        amount_float = float(amount)
-        
-        # Must be non-negative
-        if amount_float < 0:
-            return False
+        # Tendered amounts usually arrive as numbers already
+        amount_float = amount if type(amount) in (float, int) else float(amount)
         
-        # For cash payments, should be at least the total due
+        # Must be non-negative, and for cash payments at least the total due
         # (though we allow overpayment for change)
-        if total_due > 0 and amount_float < total_due:
-            return False
-        
-        return True
+        return amount_float >= 0 and (total_due <= 0 or amount_float >= total_due)
     except (ValueError, TypeError):
         return False
 
 def validate_transaction_ref(transaction_ref: str) -> bool:
     """Validate transaction reference format"""
-    if not transaction_ref or not transaction_ref.strip():
+    if not transaction_ref:
         return False
     
-    # Expected format: TXN-XXXXXXXX (8 hex characters)
-    pattern = r'^TXN-[A-F0-9]{8}$'
-    return bool(re.match(pattern, transaction_ref.strip()))
+    # Expected format: TXN-XXXXXXXX (8 uppercase hex characters)
+    transaction_ref = transaction_ref.strip()
+    return (len(transaction_ref) == 12
+            and transaction_ref.startswith('TXN-')
+            and UPPER_HEX_DIGITS.issuperset(transaction_ref[4:]))
 
 def sanitize_string(input_str: str, max_length: int = 255) -> str:
     """Sanitize string input"""
     if not input_str:
         return ""
     
-    # Strip whitespace and limit length
-    sanitized = input_str.strip()[:max_length]
-    
-    # Remove any null bytes
-    sanitized = sanitized.replace('\x00', '')
+    # Remove any null bytes (rare, so skip the copy when there are none)
+    if '\x00' in input_str:
+        input_str = input_str.replace('\x00', '')
     
-    return sanitized
+    # Strip whitespace and limit length
+    return input_str.strip()[:max_length]
 
 def format_currency(amount: Union[str, float, int], currency: str = "ZAR") -> str:
     """Format amount as currency string"""
     try:
-        amount_float = float(amount)
-        if currency == "ZAR":
-            return f"R{amount_float:.2f}"
-        else:
-            return f"{currency} {amount_float:.2f}"
+        # Prices and totals are nearly always floats already
+        amount_float = amount if type(amount) is float else float(amount)
     except (ValueError, TypeError):
         return f"{currency} 0.00"
+    
+    formatter = CURRENCY_FORMATS.get(currency)
+    if formatter is None:
+        if not (isinstance(currency, str) and currency.isalpha()):
+            return f"{currency} {amount_float:.2f}"
+        formatter = CURRENCY_FORMATS.setdefault(currency, f"{currency} {{:.2f}}".format)
+    return formatter(amount_float)
 
 def parse_currency(currency_str: str) -> float:
     """Parse currency string to float"""
     try:
-        # Remove currency symbols and spaces
-        clean_str = re.sub(r'[^\d.-]', '', currency_str)
+        # Remove currency symbols and spaces; the regex only handles odd input
+        clean_str = currency_str.translate(CURRENCY_DECORATIONS)
+        if not CURRENCY_CHARS.issuperset(clean_str):
+            clean_str = NON_CURRENCY_CHARS.sub('', currency_str)
         return float(clean_str)
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, AttributeError):
         return 0.0